@@ -0,0 +1,3 @@
+#usr/bin/zsh
+
+python3 src/benchmark.py "$@"
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import shutil
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+SyncResult = namedtuple("SyncResult", ["copied", "skipped", "removed"])
+
+_CHUNK = 1 << 20
+
+
+def scan_files(directory: str) -> Dict[str, os.stat_result]:
+    files = {}
+    for root, dirs, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, directory).replace(os.sep, "/")
+            files[rel] = os.stat(path)
+    return dict(sorted(files.items()))
+
+
+def remove_output(output_dir: str, rel: str) -> None:
+    path = os.path.join(output_dir, rel)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    # Drop directories the removal left empty, up to the output root
+    parent = os.path.dirname(path)
+    while os.path.abspath(parent) != os.path.abspath(output_dir):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            break
+        parent = os.path.dirname(parent)
+
+
+def _file_digest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, size: int) -> None:
+    # copy_file_range lets the kernel (or a reflink-capable filesystem) copy
+    # without the data passing through user space; sendfile is the fallback
+    # for kernels or filesystem pairs that refuse it.
+    for copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+        if copy is None:
+            continue
+        offset = 0
+        try:
+            while offset < size:
+                if copy is os.sendfile:
+                    sent = copy(dst_fd, src_fd, offset, min(size - offset, _CHUNK))
+                else:
+                    sent = copy(src_fd, dst_fd, min(size - offset, _CHUNK), offset, offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError:
+            if offset:
+                raise
+            continue
+        if offset == size:
+            return
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    os.lseek(dst_fd, 0, os.SEEK_SET)
+    os.ftruncate(dst_fd, 0)
+    with open(src_fd, "rb", closefd=False) as fsrc, open(dst_fd, "wb", closefd=False) as fdst:
+        shutil.copyfileobj(fsrc, fdst, _CHUNK)
+
+
+def copy_asset(src: str, dst: str, st: os.stat_result, hardlink: bool = False) -> None:
+    # Written under a temporary name and moved into place, so the output
+    # never holds a half-copied file.
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = f"{dst}.tmp-{os.getpid()}"
+    if hardlink:
+        try:
+            os.link(src, tmp)
+            os.replace(tmp, dst)
+            return
+        except OSError:
+            # e.g. the output is on another filesystem; fall back to copying
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    try:
+        with open(src, "rb") as fsrc, open(tmp, "wb") as fdst:
+            _kernel_copy(fsrc.fileno(), fdst.fileno(), st.st_size)
+        shutil.copymode(src, tmp)
+        # Keep the source mtime so the next sync can skip by size and mtime
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _unchanged(src: str, dst: str, st: os.stat_result, checksum: bool) -> bool:
+    try:
+        out = os.stat(dst)
+    except FileNotFoundError:
+        return False
+    if out.st_size != st.st_size:
+        return False
+    if out.st_mtime_ns == st.st_mtime_ns:
+        return True
+    if checksum and _file_digest(src) == _file_digest(dst):
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return True
+    return False
+
+
+def sync_static(
+    static_dir: str,
+    output_dir: str,
+    previous: Iterable[str] = (),
+    workers: Optional[int] = None,
+    hardlink: bool = False,
+    checksum: bool = False,
+    reserved: Iterable[str] = (),
+) -> SyncResult:
+    # Mirrors static_dir into output_dir. `previous` lists the assets synced
+    # last time; those no longer in static_dir are pruned from the output,
+    # while files the build wrote there itself are left alone. An asset at a
+    # path in `reserved` (the content pages' outputs) is an error.
+    sources = scan_files(static_dir)
+    reserved = frozenset(reserved)
+    collisions = sorted(reserved.intersection(sources))
+    if collisions:
+        raise ValueError(f"Static file {collisions[0]} would overwrite a content page's output")
+    pending = []
+    skipped = []
+    for rel, st in sources.items():
+        src = os.path.join(static_dir, rel)
+        dst = os.path.join(output_dir, rel)
+        if _unchanged(src, dst, st, checksum):
+            skipped.append(rel)
+        else:
+            pending.append((src, dst, st))
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() re-raises the first copy error, if any
+            list(executor.map(lambda job: copy_asset(*job, hardlink=hardlink), pending))
+
+    # A page may have taken over a path an earlier asset used; keep its output
+    removed = sorted(set(previous) - set(sources) - reserved)
+    for rel in removed:
+        remove_output(output_dir, rel)
+
+    copied = [os.path.relpath(dst, output_dir).replace(os.sep, "/") for _, dst, _ in pending]
+    return SyncResult(copied, skipped, removed)
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor
+from typing import Optional
+
+import instrument
+from build import (
+    BuildResult,
+    SiteBuilder,
+    content_hash,
+    page_entry,
+    page_error,
+    read_source,
+    read_source_text,
+    render_file,
+    render_page,
+    scan_sources,
+)
+from converter import plain_title
+from template import compile_template
+from link_index import link_records
+from output_writer import OutputWriter
+
+DEFAULT_CONCURRENCY = 8
+
+
+def render_page_bytes(data: bytes, template: str, parse_cache=None, digest=None):
+    # Module level (and taking the template text rather than a compiled
+    # Template) so it can be sent to a ProcessPoolExecutor; each worker
+    # compiles the template once through compile_template's cache.
+    # Returns the page's HTML, title and link and image targets.
+    targets = []
+    markdown = data.decode("utf-8")
+    title = plain_title(markdown)
+    html = render_page(markdown, template, targets, parse_cache, digest, title).encode("utf-8")
+    return html, title, targets
+
+
+class AsyncSiteBuilder(SiteBuilder):
+    # Same incremental build as SiteBuilder, with source reads and output
+    # writes overlapped on threads. At most `concurrency` pages are in
+    # flight, each holding its source and rendered HTML, so memory stays
+    # bounded however many pages the site has.
+    def __init__(self, *args, concurrency: int = DEFAULT_CONCURRENCY, executor: Optional[Executor] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        # Parsing and rendering run here; None means the loop's default
+        # thread pool. Pass a ProcessPoolExecutor to use several cores.
+        self.executor = executor
+
+    async def build_async(self) -> BuildResult:
+        loop = asyncio.get_running_loop()
+        source, template_hash, template_changed = await asyncio.to_thread(self._load_template)
+        sources = await asyncio.to_thread(scan_sources, self.content_dir)
+
+        pages = {}
+        built = []
+        unchanged = []
+        skipped = 0
+        writer = OutputWriter(self.manifest_mtime_ns)
+        # Bounded, so the producer waits for a free worker (backpressure)
+        queue = asyncio.Queue(maxsize=self.concurrency)
+
+        async def produce():
+            for item in sources.items():
+                await queue.put(item)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            nonlocal skipped
+            while (item := await queue.get()) is not None:
+                rel, st = item
+                old = self._reusable(rel, template_changed)
+                if old is not None and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                    pages[rel] = old
+                    skipped += 1
+                    continue
+
+                path = os.path.join(self.content_dir, rel)
+                data, digest = await asyncio.to_thread(read_source, path, st.st_size)
+                entry = page_entry(rel, digest, st)
+                if old is not None and old["hash"] == entry["hash"]:
+                    pages[rel] = {**old, **entry}
+                    skipped += 1
+                    continue
+                pages[rel] = entry
+
+                start = time.perf_counter()
+                if data is None:
+                    output = os.path.join(self.output_dir, entry["output"])
+                    try:
+                        rendered = await loop.run_in_executor(self.executor, render_file, path, output, source)
+                    except ValueError as e:
+                        raise page_error(rel, await asyncio.to_thread(read_source_text, path), e) from e
+                    self._record_streamed(writer, entry, rendered)
+                else:
+                    try:
+                        html, entry["title"], targets = await loop.run_in_executor(
+                            self.executor, render_page_bytes, data, source, self.parse_cache, entry["hash"]
+                        )
+                    except ValueError as e:
+                        raise page_error(rel, data.decode("utf-8", "replace"), e) from e
+                    entry["links"] = link_records(entry["output"], targets)
+                    entry["output_hash"] = content_hash(html)
+                    if not await asyncio.to_thread(self._write_page, writer, rel, entry, html):
+                        unchanged.append(rel)
+                instrument.document(rel, time.perf_counter() - start)
+                built.append(rel)
+
+        tasks = [asyncio.create_task(produce())]
+        tasks += [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            # On the first failure, stop the remaining workers and producer
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        # Workers finish out of order; keep the manifest and result sorted
+        pages = {rel: pages[rel] for rel in sources}
+        return await asyncio.to_thread(
+            self._finish,
+            pages,
+            sorted(built),
+            skipped,
+            template_hash,
+            compile_template(source),
+            sorted(unchanged),
+            writer,
+        )
+
+
+async def build_site_async(
+    content_dir: str,
+    template_path: str,
+    output_dir: str,
+    manifest_path: Optional[str] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    executor: Optional[Executor] = None,
+    **kwargs,
+) -> BuildResult:
+    builder = AsyncSiteBuilder(
+        content_dir,
+        template_path,
+        output_dir,
+        manifest_path,
+        concurrency=concurrency,
+        executor=executor,
+        **kwargs,
+    )
+    return await builder.build_async()
@@ -0,0 +1,77 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+from converter import markdown_to_html
+
+# A str is markdown source, unless convert_many is called with paths=True;
+# a path object (e.g. pathlib.Path) is always a file read as UTF-8.
+Source = Union[str, os.PathLike]
+
+
+class BatchConversionError(Exception):
+    def __init__(self, index: int, source: str, reason: str) -> None:
+        super().__init__(f"Failed to convert document {index} ({source}): {reason}")
+        self.index = index
+        self.source = source
+        self.reason = reason
+
+
+def _describe(source: Source) -> str:
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    preview = source[:40] + ("..." if len(source) > 40 else "")
+    return f"markdown {preview!r}"
+
+
+def _convert_one(source: Source):
+    # Runs in the worker. Errors come back as values so the parent knows
+    # exactly which document failed, whatever the exception type.
+    try:
+        if isinstance(source, os.PathLike):
+            with open(source, encoding="utf-8") as f:
+                source = f.read()
+        return True, markdown_to_html(source)
+    except Exception as e:
+        return False, f"{type(e).__name__}: {e}"
+
+
+def _chunksize(count: int, workers: int) -> int:
+    return max(1, count // (workers * 4))
+
+
+def convert_many(
+    sources: Iterable[Source],
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    paths: bool = False,
+) -> List[str]:
+    # With paths=True every source, str included, names a file
+    if paths:
+        sources = [Path(source) for source in sources]
+    else:
+        sources = list(sources)
+    workers = max_workers or os.process_cpu_count() or 1
+    if workers == 1 or len(sources) <= 1:
+        return _collect(sources, map(_convert_one, sources))
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        results = executor.map(
+            _convert_one,
+            sources,
+            chunksize=chunksize or _chunksize(len(sources), workers),
+        )
+        return _collect(sources, results)
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _collect(sources, results) -> List[str]:
+    html = []
+    for index, (ok, value) in enumerate(results):
+        if not ok:
+            raise BatchConversionError(index, _describe(sources[index]), value)
+        html.append(value)
+    return html
@@ -0,0 +1,76 @@
+import sys
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+from node_pool import NodePool
+from textnode import TextNode, TextType
+
+
+def _text_node():
+    return TextNode("text", TextType.TEXT)
+
+
+def _plain_leaf():
+    return LeafNode("text", None)
+
+
+def _bold_leaf():
+    return LeafNode("text", "b")
+
+
+def _link_leaf():
+    return LeafNode("text", "a", {"href": "https://www.boot.dev"})
+
+
+_POOL = NodePool()
+
+
+def _pooled_link_leaf():
+    return _POOL.leaf("text", "a", {"href": "https://www.boot.dev"})
+
+
+_SHARED_CHILDREN = [LeafNode("text", None)]
+
+
+def _parent():
+    return ParentNode("p", _SHARED_CHILDREN)
+
+
+FACTORIES = {
+    "TextNode": _text_node,
+    "LeafNode(text)": _plain_leaf,
+    "LeafNode(b)": _bold_leaf,
+    "LeafNode(a, props)": _link_leaf,
+    "LeafNode(a, pooled)": _pooled_link_leaf,
+    "ParentNode": _parent,
+}
+
+
+def bytes_per_node(factory, count: int = 100_000) -> float:
+    # The holding list is allocated before tracing starts, so only the nodes
+    # themselves (and anything they allocate) are counted.
+    nodes = [None] * count
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for i in range(count):
+            nodes[i] = factory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / count
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    count = int(argv[0]) if argv else 100_000
+
+    print(f"{'node':<20} {'bytes/node':>10}")
+    for name, factory in FACTORIES.items():
+        print(f"{name:<20} {bytes_per_node(factory, count):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
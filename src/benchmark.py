@@ -0,0 +1,238 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from htmlnode import LeafNode, ParentNode
+from node_utils import text_node_to_html_node, text_nodes_to_html
+from split_delimiter import split_nodes_delimiter, split_nodes_image, split_nodes_link
+from textnode import TextNode, TextType
+
+WORDS = (
+    "static site generator markdown node parser render output page build "
+    "content template html text inline block link image code bold italic"
+).split()
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _url(rng):
+    return f"https://example.com/{rng.choice(WORDS)}/{rng.randrange(10_000)}"
+
+
+def gen_prose(rng, size):
+    parts = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < 0.1:
+            parts.append(f"**{_words(rng, 2)}**")
+        elif roll < 0.2:
+            parts.append(f"_{_words(rng, 2)}_")
+        elif roll < 0.25:
+            parts.append(f"`{_words(rng, 1)}`")
+        else:
+            parts.append(_words(rng, 6))
+    return " ".join(parts)
+
+
+def gen_links(rng, size):
+    return " ".join(f"[{_words(rng, 2)}]({_url(rng)}) {_words(rng, 2)}" for _ in range(size))
+
+
+def gen_images(rng, size):
+    return " ".join(f"![{_words(rng, 2)}]({_url(rng)}.png) {_words(rng, 2)}" for _ in range(size))
+
+
+def gen_huge_paragraph(rng, size):
+    return gen_prose(rng, size * 20)
+
+
+def gen_nested_tree(rng, size):
+    # Nested lists: `size` levels deep, each level carrying a few leaves
+    node = LeafNode(_words(rng, 3), "li")
+    for depth in range(size):
+        leaves = [LeafNode(_words(rng, 3), "li") for _ in range(rng.randint(1, 4))]
+        node = ParentNode("ul" if depth % 2 else "li", leaves + [node])
+    return node
+
+
+def gen_wide_tree(rng, size):
+    # A flat list of `size * 20` short items
+    items = [
+        ParentNode("li", [LeafNode(_words(rng, 2), None), LeafNode(_words(rng, 1), "b")])
+        for _ in range(size * 20)
+    ]
+    return ParentNode("ul", items)
+
+
+TEXT_WORKLOADS = {
+    "prose": gen_prose,
+    "links": gen_links,
+    "images": gen_images,
+    "huge_paragraph": gen_huge_paragraph,
+}
+TREE_WORKLOADS = {
+    # Depth is capped well below the recursion limit of the recursive renderer
+    "nested_tree": lambda rng, size: gen_nested_tree(rng, min(size, 200)),
+    "wide_tree": gen_wide_tree,
+}
+# Only the iterative renderer can handle these
+DEEP_TREE_WORKLOADS = {
+    "deep_tree": lambda rng, size: gen_nested_tree(rng, size * 40),
+}
+
+
+def stage_delimiter(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "`", TextType.CODE)
+
+
+def stage_image_link(nodes):
+    return split_nodes_link(split_nodes_image(nodes))
+
+
+def stage_html_nodes(nodes):
+    return ParentNode("p", [text_node_to_html_node(node) for node in nodes])
+
+
+def stage_leaf_nodes_to_html(nodes):
+    return "".join(text_node_to_html_node(node).to_html() for node in nodes)
+
+
+def stage_text_nodes_to_html(nodes):
+    return text_nodes_to_html(nodes)
+
+
+def stage_to_html(node):
+    return node.to_html()
+
+
+def stage_to_html_unescaped(node):
+    return node.to_html(escape=False)
+
+
+def render_recursive(node):
+    # The original recursive, concatenating ParentNode.to_html, kept as a
+    # baseline for the iterative renderer
+    if isinstance(node, LeafNode):
+        return node.to_html()
+    children_html = ""
+    for child in node.children:
+        children_html += render_recursive(child)
+    return f"<{node.tag}{node.props_to_html()}>{children_html}</{node.tag}>"
+
+
+TEXT_STAGES = [
+    ("delimiter", stage_delimiter),
+    ("image_link", stage_image_link),
+    ("text_node_to_html_node", stage_html_nodes),
+    ("to_html", stage_to_html),
+]
+# Timed on the same input as the pipeline stage they are keyed by
+TEXT_ALTERNATIVES = {
+    "text_node_to_html_node": [
+        ("leaf_nodes_to_html", stage_leaf_nodes_to_html),
+        ("text_nodes_to_html", stage_text_nodes_to_html),
+    ],
+    "to_html": [("to_html_unescaped", stage_to_html_unescaped)],
+}
+TREE_STAGES = [
+    ("to_html_recursive", render_recursive),
+    ("to_html_unescaped", stage_to_html_unescaped),
+    ("to_html", stage_to_html),
+]
+DEEP_TREE_STAGES = [
+    ("to_html", stage_to_html),
+]
+
+
+def time_stage(func, arg, repeat):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append(time.perf_counter() - start)
+    return result, {"best": min(timings), "mean": sum(timings) / len(timings)}
+
+
+def run_pipeline(stages, data, repeat, alternatives=None):
+    results = {}
+    for name, func in stages:
+        for alt_name, alt_func in (alternatives or {}).get(name, []):
+            results[alt_name] = time_stage(alt_func, data, repeat)[1]
+        data, results[name] = time_stage(func, data, repeat)
+    return results
+
+
+def run_alternatives(stages, data, repeat):
+    # Every stage renders the same input, so their timings compare directly
+    return {name: time_stage(func, data, repeat)[1] for name, func in stages}
+
+
+def run_benchmarks(seed=0, size=500, repeat=5):
+    results = {}
+    for name, generate in TEXT_WORKLOADS.items():
+        results[name] = run_pipeline(
+            TEXT_STAGES, generate(random.Random(seed), size), repeat, TEXT_ALTERNATIVES
+        )
+    for name, generate in TREE_WORKLOADS.items():
+        results[name] = run_alternatives(TREE_STAGES, generate(random.Random(seed), size), repeat)
+    for name, generate in DEEP_TREE_WORKLOADS.items():
+        results[name] = run_alternatives(DEEP_TREE_STAGES, generate(random.Random(seed), size), repeat)
+    return {
+        "meta": {
+            "seed": seed,
+            "size": size,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+        },
+        "results": results,
+    }
+
+
+def format_report(report, baseline=None):
+    lines = [f"{'workload':<16} {'stage':<24} {'best ms':>10} {'mean ms':>10}"]
+    if baseline is not None:
+        lines[0] += f" {'vs base':>8}"
+    for workload, stages in report["results"].items():
+        for stage, timing in stages.items():
+            line = f"{workload:<16} {stage:<24} {timing['best'] * 1000:>10.3f} {timing['mean'] * 1000:>10.3f}"
+            if baseline is not None:
+                base = baseline["results"].get(workload, {}).get(stage)
+                line += f" {base['best'] / timing['best']:>7.2f}x" if base else f" {'-':>8}"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the markdown to HTML pipeline")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.seed, args.size, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(format_report(report, baseline))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import re
+from collections import namedtuple
+from enum import Enum
+from typing import Iterable, Iterator
+
+
+class BlockType(Enum):
+    PARAGRAPH = "paragraph"
+    HEADING = "heading"
+    CODE = "code"
+    QUOTE = "quote"
+    UNORDERED_LIST = "unordered_list"
+    ORDERED_LIST = "ordered_list"
+
+
+# `text` is the block's source lines joined by "\n", verbatim apart from the
+# line endings; `offset` is the character offset of its first line.
+Block = namedtuple("Block", ["block_type", "text", "offset"])
+
+HEADING_PATTERN = re.compile(r"#{1,6} ")
+ORDERED_ITEM_PATTERN = re.compile(r"(\d+)\. ")
+CODE_FENCE = "```"
+
+
+def block_to_block_type(text: str) -> BlockType:
+    if HEADING_PATTERN.match(text):
+        return BlockType.HEADING
+    if text.startswith(CODE_FENCE):
+        return BlockType.CODE
+
+    lines = text.split("\n")
+    if all(line.startswith(">") for line in lines):
+        return BlockType.QUOTE
+    if all(line.startswith("- ") for line in lines):
+        return BlockType.UNORDERED_LIST
+    for number, line in enumerate(lines, 1):
+        match = ORDERED_ITEM_PATTERN.match(line)
+        if match is None or int(match.group(1)) != number:
+            break
+    else:
+        return BlockType.ORDERED_LIST
+    return BlockType.PARAGRAPH
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[Block]:
+    # Consumes lines one at a time and yields each block as soon as it ends,
+    # so only the block being collected is held in memory. Blank lines
+    # separate blocks, a heading line is always a block of its own, and a
+    # code fence runs until its closing fence (or the end of the input).
+    block_lines = []
+    block_offset = 0
+    in_code = False
+    offset = 0
+
+    def flush():
+        text = "\n".join(block_lines)
+        block_lines.clear()
+        return Block(block_to_block_type(text), text, block_offset)
+
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n")
+        line_offset = offset
+        offset += len(raw_line)
+
+        if in_code:
+            block_lines.append(line)
+            if line.startswith(CODE_FENCE):
+                in_code = False
+                yield flush()
+            continue
+
+        if not line.strip():
+            if block_lines:
+                yield flush()
+            continue
+
+        if line.startswith(CODE_FENCE) or HEADING_PATTERN.match(line):
+            if block_lines:
+                yield flush()
+            block_offset = line_offset
+            block_lines.append(line)
+            if line.startswith(CODE_FENCE):
+                in_code = True
+            else:
+                yield flush()
+            continue
+
+        if not block_lines:
+            block_offset = line_offset
+        block_lines.append(line)
+
+    if block_lines:
+        yield flush()
+
+
+def iter_file_blocks(path: str) -> Iterator[Block]:
+    # Buffered line iteration: peak memory is bounded by the largest block,
+    # not by the size of the file.
+    with open(path, encoding="utf-8") as f:
+        yield from iter_blocks(f)
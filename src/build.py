@@ -0,0 +1,438 @@
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from typing import Dict, Optional, Union
+
+import instrument
+from assets import remove_output, sync_static
+from compress import SIDECAR_SUFFIX, check_level, compress_outputs
+from converter import file_title, iter_markdown_file_html, markdown_to_html, parsed_to_html, plain_title
+from htmlnode import escape_text
+from link_index import LinkIndex, broken_links, line_and_column, link_records
+from output_writer import OutputWriter, write_atomic
+from parse_cache import ParseCache, parse_markdown_cached
+from sitemap import Generator, generate_feed, generate_listing, generate_sitemaps
+from template import Template, compile_template
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 4
+# Sources this large are hashed and rendered while streaming, not read whole
+STREAM_BYTES = 1 << 20
+_CHUNK = 1 << 16
+
+# `assets` is the SyncResult of the static copy, or None when it was not
+# run; `broken` lists every BrokenLink currently on the site; `generated`
+# is the GenerateResult for sitemaps, feed and listing pages; `compressed`
+# the CompressResult for .gz sidecars, or None when they are disabled;
+# `unchanged` lists the built pages whose rendered HTML matched the file
+# already on disk, which was therefore left untouched; `writes` is the
+# WriteResult over every page and generated file
+BuildResult = namedtuple(
+    "BuildResult",
+    ["built", "skipped", "removed", "assets", "broken", "generated", "compressed", "unchanged", "writes"],
+    defaults=(None, (), None, None, (), None),
+)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path: str) -> str:
+    # content_hash of a file, read in chunks
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def output_path_for(source: str) -> str:
+    # "blog/post.md" -> "blog/post.html"
+    return os.path.splitext(source)[0] + ".html"
+
+
+def render_page(
+    markdown: str,
+    template: Union[str, Template],
+    targets: Optional[list] = None,
+    parse_cache: Optional[ParseCache] = None,
+    digest: Optional[str] = None,
+    title: Optional[str] = None,
+) -> str:
+    # With a parse cache, `digest` is the content_hash of the markdown's
+    # bytes; it is computed when not given, as is the page's plain_title
+    if isinstance(template, str):
+        template = compile_template(template)
+    if title is None:
+        title = plain_title(markdown)
+    title = escape_text(title)
+    if parse_cache is None:
+        content = markdown_to_html(markdown, targets)
+    else:
+        digest = digest or content_hash(markdown.encode("utf-8"))
+        content = parsed_to_html(parse_markdown_cached(parse_cache, digest, markdown, targets))
+    with instrument.stage("template"):
+        return template.render({"Title": title, "Content": content})
+
+
+def render_file(path: str, output_path: str, template: Union[str, Template]):
+    # render_page for sources of STREAM_BYTES or more: the page is rendered
+    # block by block straight to output_path, so neither the markdown nor its
+    # HTML is ever held whole. Such pages bypass the parse cache, whose entry
+    # would hold the whole document. Module level so it can be sent to a
+    # ProcessPoolExecutor. Returns the page's title, link and image targets,
+    # and the content_hash and size of the output.
+    if isinstance(template, str):
+        template = compile_template(template)
+    title = file_title(path)
+    targets = []
+    h = hashlib.sha256()
+    size = 0
+
+    def chunks():
+        nonlocal size
+        values = {"Title": escape_text(title), "Content": iter_markdown_file_html(path, targets)}
+        for part in template.iter_parts(values):
+            data = part.encode("utf-8")
+            h.update(data)
+            size += len(data)
+            yield part
+
+    write_atomic(output_path, chunks())
+    return title, targets, h.hexdigest(), size
+
+
+def page_error(rel: str, markdown: str, error: ValueError) -> ValueError:
+    # Names the page, and the source line and column when the error carries
+    # an offset into the markdown (an InlineSyntaxError)
+    offset = getattr(error, "offset", None)
+    if offset is None:
+        return ValueError(f"{rel}: {error}")
+    line, column = line_and_column(markdown, offset)
+    return ValueError(f"{rel}:{line}:{column}: {getattr(error, 'message', error)}")
+
+
+def read_source_text(path: str) -> str:
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def scan_sources(content_dir: str) -> Dict[str, os.stat_result]:
+    sources = {}
+    for root, dirs, files in os.walk(content_dir):
+        for name in files:
+            if name.endswith(".md"):
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, content_dir).replace(os.sep, "/")
+                sources[rel] = os.stat(path)
+    return dict(sorted(sources.items()))
+
+
+def read_source(path: str, size: int):
+    # (data, content_hash) of a source. One of STREAM_BYTES or more is only
+    # hashed, in chunks, and data is None; render_file streams it again.
+    with instrument.stage("read"):
+        if size >= STREAM_BYTES:
+            return None, file_hash(path)
+        with open(path, "rb") as f:
+            data = f.read()
+    return data, content_hash(data)
+
+
+def page_entry(rel: str, digest: str, st: os.stat_result) -> dict:
+    return {
+        "hash": digest,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "output": output_path_for(rel),
+    }
+
+
+def _empty_manifest() -> dict:
+    return {"version": MANIFEST_VERSION, "template": None, "pages": {}, "assets": [], "generated": {}, "compressed": {}}
+
+
+def load_manifest(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return _empty_manifest()
+    if manifest.get("version") != MANIFEST_VERSION:
+        return _empty_manifest()
+    return manifest
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def save_manifest(path: str, manifest: dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class SiteBuilder:
+    def __init__(
+        self,
+        content_dir: str,
+        template_path: str,
+        output_dir: str,
+        manifest_path: Optional[str] = None,
+        static_dir: Optional[str] = None,
+        asset_workers: Optional[int] = None,
+        hardlink_assets: bool = False,
+        parse_cache_dir: Optional[str] = None,
+        base_url: Optional[str] = None,
+        site_title: str = "Site",
+        listing_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        compress_workers: Optional[int] = None,
+    ) -> None:
+        self.content_dir = content_dir
+        # Writes a .gz sidecar for every page and generated file when set;
+        # checked here so a bad level fails before any page is written
+        self.gzip_level = gzip_level if gzip_level is None else check_level(gzip_level)
+        self.compress_workers = compress_workers
+        # base_url enables sitemap.xml and feed.xml; listing_size enables
+        # paginated listing pages with that many entries each
+        self.base_url = base_url
+        self.site_title = site_title
+        self.listing_size = listing_size
+        self.parse_cache = ParseCache(parse_cache_dir) if parse_cache_dir else None
+        self.static_dir = static_dir
+        self.asset_workers = asset_workers
+        self.hardlink_assets = hardlink_assets
+        self.template_path = template_path
+        self.output_dir = output_dir
+        self.manifest_path = manifest_path or os.path.join(output_dir, MANIFEST_NAME)
+        self.manifest = load_manifest(self.manifest_path)
+        # Outputs modified after this are not trusted to match their digest
+        self.manifest_mtime_ns = _mtime_ns(self.manifest_path)
+        # Output files seen by the last link check, so unchanged pages keep
+        # their recorded "broken" lists across runs
+        self.links = LinkIndex(self.manifest.get("known"))
+
+    def _load_template(self):
+        if not os.path.isdir(self.content_dir):
+            raise FileNotFoundError(f"Content directory not found: {self.content_dir}")
+        with open(self.template_path, encoding="utf-8") as f:
+            source = f.read()
+        template_hash = content_hash(source.encode("utf-8"))
+        return source, template_hash, template_hash != self.manifest["template"]
+
+    def _reusable(self, rel: str, template_changed: bool) -> Optional[dict]:
+        # The recorded entry, if its output can be kept as long as the
+        # source content is unchanged
+        old = self.manifest["pages"].get(rel)
+        if (
+            old is not None
+            and not template_changed
+            and old["output"] == output_path_for(rel)
+            and os.path.exists(os.path.join(self.output_dir, old["output"]))
+        ):
+            return old
+        return None
+
+    def _write_page(self, writer: OutputWriter, rel: str, entry: dict, html: bytes) -> bool:
+        # The previous build's digest of the same output stands in for
+        # re-reading the file when sizes match (e.g. a template edit that
+        # leaves this page's HTML identical)
+        old = self.manifest["pages"].get(rel)
+        previous = old.get("output_hash") if old is not None and old["output"] == entry["output"] else None
+        path = os.path.join(self.output_dir, entry["output"])
+        with instrument.stage("write"):
+            written = writer.write(path, html, entry["output_hash"], previous)
+        if written:
+            instrument.count("write", bytes=len(html))
+        return written
+
+    def _record_streamed(self, writer: OutputWriter, entry: dict, rendered: tuple) -> None:
+        # A page render_file has written; its source changed, so its output
+        # is counted as written without comparing it to the previous one
+        entry["title"], targets, entry["output_hash"], size = rendered
+        entry["links"] = link_records(entry["output"], targets)
+        writer.wrote(os.path.join(self.output_dir, entry["output"]))
+        instrument.count("write", bytes=size)
+
+    def build(self) -> BuildResult:
+        source, template_hash, template_changed = self._load_template()
+        template = compile_template(source)
+        writer = OutputWriter(self.manifest_mtime_ns)
+
+        pages = {}
+        built = []
+        unchanged = []
+        skipped = 0
+
+        for rel, st in scan_sources(self.content_dir).items():
+            old = self._reusable(rel, template_changed)
+
+            # Unchanged size and mtime: trust the recorded hash, skip the read
+            if old is not None and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                pages[rel] = old
+                skipped += 1
+                continue
+
+            path = os.path.join(self.content_dir, rel)
+            data, digest = read_source(path, st.st_size)
+            entry = page_entry(rel, digest, st)
+            if old is not None and old["hash"] == entry["hash"]:
+                pages[rel] = {**old, **entry}
+                skipped += 1
+                continue
+            pages[rel] = entry
+
+            start = time.perf_counter()
+            if data is None:
+                try:
+                    rendered = render_file(path, os.path.join(self.output_dir, entry["output"]), template)
+                except ValueError as e:
+                    raise page_error(rel, read_source_text(path), e) from e
+                self._record_streamed(writer, entry, rendered)
+            else:
+                targets = []
+                markdown = data.decode("utf-8")
+                try:
+                    entry["title"] = plain_title(markdown)
+                    html = render_page(
+                        markdown, template, targets, self.parse_cache, entry["hash"], entry["title"]
+                    ).encode("utf-8")
+                except ValueError as e:
+                    raise page_error(rel, markdown, e) from e
+                entry["links"] = link_records(entry["output"], targets)
+                entry["output_hash"] = content_hash(html)
+                if not self._write_page(writer, rel, entry, html):
+                    unchanged.append(rel)
+            instrument.document(rel, time.perf_counter() - start)
+            built.append(rel)
+
+        return self._finish(pages, built, skipped, template_hash, template, unchanged, writer)
+
+    def _finish(
+        self,
+        pages: dict,
+        built: list,
+        skipped: int,
+        template_hash: str,
+        template: Template,
+        unchanged: list = (),
+        writer: Optional[OutputWriter] = None,
+    ) -> BuildResult:
+        # Prunes outputs of deleted sources, syncs static assets, regenerates
+        # sitemaps, feed and listing pages, checks links and saves the manifest
+        old_pages = self.manifest["pages"]
+        removed = sorted(set(old_pages) - set(pages))
+        for rel in removed:
+            remove_output(self.output_dir, old_pages[rel]["output"])
+
+        outputs = {entry["output"] for entry in pages.values()}
+        assets = None
+        asset_list = self.manifest.get("assets", [])
+        if self.static_dir is not None:
+            with instrument.stage("assets"):
+                assets = sync_static(
+                    self.static_dir,
+                    self.output_dir,
+                    previous=asset_list,
+                    workers=self.asset_workers,
+                    hardlink=self.hardlink_assets,
+                    reserved=outputs,
+                )
+            asset_list = sorted(assets.copied + assets.skipped)
+            instrument.count("assets", nodes=len(assets.copied))
+
+        with instrument.stage("generate"):
+            if writer is None:
+                writer = OutputWriter(self.manifest_mtime_ns)
+            generator = Generator(self.output_dir, self.manifest.get("generated"), writer, reserved=outputs)
+            if self.base_url:
+                generate_sitemaps(generator, pages, self.base_url)
+                generate_feed(generator, pages, self.base_url, self.site_title)
+            if self.listing_size:
+                generate_listing(generator, pages, template, self.listing_size)
+            # Also removes files generated last time but not this time
+            generated = generator.finish()
+
+        compressed = None
+        sidecars = {}
+        if self.gzip_level is not None:
+            outputs = {entry["output"]: entry["output_hash"] for entry in pages.values()}
+            outputs.update(generator.digests)
+            with instrument.stage("compress"):
+                compressed, sidecars = compress_outputs(
+                    self.output_dir,
+                    outputs,
+                    self.manifest.get("compressed"),
+                    self.gzip_level,
+                    workers=self.compress_workers,
+                )
+            instrument.count("compress", nodes=len(compressed.written))
+        else:
+            # Drop sidecars left over from a build that had them enabled
+            for rel in self.manifest.get("compressed", {}):
+                remove_output(self.output_dir, rel + SIDECAR_SUFFIX)
+
+        with instrument.stage("link_check"):
+            known = set(outputs)
+            known.update(asset_list)
+            known.update(generator.digests)
+            rechecked = self.links.update(pages, built, known)
+        instrument.count("link_check", nodes=len(rechecked))
+
+        self.manifest = {
+            "version": MANIFEST_VERSION,
+            "template": template_hash,
+            "pages": pages,
+            "assets": asset_list,
+            "generated": generator.digests,
+            "compressed": sidecars,
+            "known": sorted(known),
+        }
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        save_manifest(self.manifest_path, self.manifest)
+        self.manifest_mtime_ns = _mtime_ns(self.manifest_path)
+        return BuildResult(
+            built, skipped, removed, assets, broken_links(pages), generated, compressed, list(unchanged),
+            writer.result(),
+        )
+
+
+def build_site(
+    content_dir: str,
+    template_path: str,
+    output_dir: str,
+    manifest_path: Optional[str] = None,
+    static_dir: Optional[str] = None,
+    asset_workers: Optional[int] = None,
+    hardlink_assets: bool = False,
+    parse_cache_dir: Optional[str] = None,
+    base_url: Optional[str] = None,
+    site_title: str = "Site",
+    listing_size: Optional[int] = None,
+    gzip_level: Optional[int] = None,
+    compress_workers: Optional[int] = None,
+) -> BuildResult:
+    return SiteBuilder(
+        content_dir,
+        template_path,
+        output_dir,
+        manifest_path,
+        static_dir=static_dir,
+        asset_workers=asset_workers,
+        hardlink_assets=hardlink_assets,
+        parse_cache_dir=parse_cache_dir,
+        base_url=base_url,
+        site_title=site_title,
+        listing_size=listing_size,
+        gzip_level=gzip_level,
+        compress_workers=compress_workers,
+    ).build()
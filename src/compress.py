@@ -0,0 +1,65 @@
+import gzip
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from assets import remove_output
+from output_writer import write_atomic
+
+DEFAULT_LEVEL = 9
+SIDECAR_SUFFIX = ".gz"
+
+CompressResult = namedtuple("CompressResult", ["written", "skipped", "removed"])
+
+
+def check_level(level: int) -> int:
+    if not 0 <= level <= 9:
+        raise ValueError(f"Invalid gzip level: {level}")
+    return level
+
+
+def gzip_bytes(data: bytes, level: int = DEFAULT_LEVEL) -> bytes:
+    # mtime=0 keeps the output a pure function of the input, so unchanged
+    # pages produce byte-identical sidecars
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def write_sidecar(path: str, level: int = DEFAULT_LEVEL) -> None:
+    with open(path, "rb") as f:
+        data = gzip_bytes(f.read(), level)
+    write_atomic(path + SIDECAR_SUFFIX, data)
+
+
+def compress_outputs(
+    output_dir: str,
+    digests: Dict[str, str],
+    previous: Optional[Dict[str, str]] = None,
+    level: int = DEFAULT_LEVEL,
+    workers: Optional[int] = None,
+) -> Tuple[CompressResult, Dict[str, str]]:
+    # Writes a .gz sidecar next to each output in `digests` (output path ->
+    # content digest). `previous` is what the last run returned; outputs whose
+    # digest and level are unchanged and whose sidecar exists are skipped,
+    # and sidecars of outputs that are gone are removed. zlib releases the
+    # GIL while compressing, so a thread pool compresses files in parallel.
+    check_level(level)
+    previous = previous or {}
+    recorded = {rel: f"{level}:{digest}" for rel, digest in digests.items()}
+
+    pending = []
+    skipped = []
+    for rel, key in recorded.items():
+        if previous.get(rel) == key and os.path.exists(os.path.join(output_dir, rel + SIDECAR_SUFFIX)):
+            skipped.append(rel)
+        else:
+            pending.append(rel)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda rel: write_sidecar(os.path.join(output_dir, rel), level), pending))
+
+    removed = sorted(set(previous) - set(recorded))
+    for rel in removed:
+        remove_output(output_dir, rel + SIDECAR_SUFFIX)
+    return CompressResult(pending, skipped, removed), recorded
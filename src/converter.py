@@ -0,0 +1,249 @@
+import io
+from bisect import bisect_right
+from collections import namedtuple
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import instrument
+from block_parser import (
+    ORDERED_ITEM_PATTERN,
+    Block,
+    BlockType,
+    iter_blocks,
+    iter_file_blocks,
+)
+from htmlnode import HTMLNode, LeafNode, ParentNode, escape_text
+from node_pool import DEFAULT_POOL
+from node_utils import text_node_to_html_node, text_nodes_to_html
+from split_delimiter import InlineSyntaxError, tokenize_inline
+from textnode import TextNode
+
+
+# A block after inline parsing: (tag, item_tag, content). content is a
+# TextNode list when item_tag is None, the code text for "pre"/"code", and
+# one TextNode list per item for lists. Rebuilding the HTML tree from it
+# needs no tokenizing, which is what the parse cache relies on.
+ParsedBlock = namedtuple("ParsedBlock", ["tag", "item_tag", "content"])
+
+
+def parse_inline(
+    text: str,
+    targets: Optional[list] = None,
+    to_source: Optional[Callable[[int], int]] = None,
+) -> List[TextNode]:
+    # Appends (offset, kind, url) to `targets` for every image and link, with
+    # offsets mapped back to the markdown source by to_source, which also
+    # maps the offset of an InlineSyntaxError
+    on_target = None
+    if targets is not None:
+        def on_target(offset, text_type, url):
+            targets.append((to_source(offset), text_type.value, url))
+    with instrument.stage("tokenize_inline"):
+        try:
+            text_nodes = tokenize_inline(text, on_target=on_target)
+        except InlineSyntaxError as e:
+            if to_source is None:
+                raise
+            raise InlineSyntaxError(e.message, to_source(e.offset)) from None
+    instrument.count("tokenize_inline", nodes=len(text_nodes))
+    return text_nodes
+
+
+def text_nodes_to_children(text_nodes: List[TextNode]) -> List[HTMLNode]:
+    with instrument.stage("text_node_to_html_node"):
+        children = [text_node_to_html_node(text_node, DEFAULT_POOL) for text_node in text_nodes]
+    instrument.count("text_node_to_html_node", nodes=len(children))
+    return children or [LeafNode("", None)]
+
+
+def text_nodes_html(text_nodes: List[TextNode]) -> str:
+    with instrument.stage("text_node_to_html_node"):
+        html = text_nodes_to_html(text_nodes)
+    instrument.count("text_node_to_html_node", nodes=len(text_nodes))
+    return html
+
+
+def text_to_children(
+    text: str,
+    targets: Optional[list] = None,
+    to_source: Optional[Callable[[int], int]] = None,
+) -> List[HTMLNode]:
+    return text_nodes_to_children(parse_inline(text, targets, to_source))
+
+
+def _strip_quote(line: str) -> str:
+    line = line[1:]
+    return line[1:] if line.startswith(" ") else line
+
+
+def _shifted(base: int) -> Callable[[int], int]:
+    return lambda offset: base + offset
+
+
+def _quote_offsets(block: Block) -> Callable[[int], int]:
+    # Each quote line loses a different prefix ("> " or ">"), so offsets in
+    # the stripped text are mapped back line by line
+    quote_starts = []
+    source_starts = []
+    position = 0
+    source = block.offset
+    for line in block.text.split("\n"):
+        stripped = _strip_quote(line)
+        quote_starts.append(position)
+        source_starts.append(source + len(line) - len(stripped))
+        position += len(stripped) + 1
+        source += len(line) + 1
+
+    def to_source(offset):
+        line = bisect_right(quote_starts, offset) - 1
+        return source_starts[line] + offset - quote_starts[line]
+    return to_source
+
+
+def parse_block(block: Block, targets: Optional[list] = None) -> ParsedBlock:
+    # With `targets`, every image and link in the block is recorded as
+    # (source offset, kind, url); see parse_inline
+    text = block.text
+
+    match block.block_type:
+        case BlockType.PARAGRAPH:
+            return ParsedBlock("p", None, parse_inline(text, targets, _shifted(block.offset)))
+
+        case BlockType.HEADING:
+            level = len(text) - len(text.lstrip("#"))
+            return ParsedBlock(
+                f"h{level}",
+                None,
+                parse_inline(text[level + 1:], targets, _shifted(block.offset + level + 1)),
+            )
+
+        case BlockType.CODE:
+            lines = text.split("\n")[1:]
+            if lines and lines[-1].startswith("```"):
+                lines.pop()
+            code = "\n".join(lines) + "\n" if lines else ""
+            return ParsedBlock("pre", "code", code)
+
+        case BlockType.QUOTE:
+            quote = "\n".join(_strip_quote(line) for line in text.split("\n"))
+            return ParsedBlock("blockquote", None, parse_inline(quote, targets, _quote_offsets(block)))
+
+        case BlockType.UNORDERED_LIST:
+            items = []
+            start = block.offset
+            for line in text.split("\n"):
+                items.append(parse_inline(line[2:], targets, _shifted(start + 2)))
+                start += len(line) + 1
+            return ParsedBlock("ul", "li", items)
+
+        case BlockType.ORDERED_LIST:
+            items = []
+            start = block.offset
+            for line in text.split("\n"):
+                marker = ORDERED_ITEM_PATTERN.match(line).end()
+                items.append(parse_inline(line[marker:], targets, _shifted(start + marker)))
+                start += len(line) + 1
+            return ParsedBlock("ol", "li", items)
+
+        case _:
+            raise ValueError(f"Unsupported BlockType: {block.block_type}")
+
+
+def parsed_block_to_html_node(parsed: ParsedBlock) -> HTMLNode:
+    tag, item_tag, content = parsed
+    if item_tag is None:
+        return ParentNode(tag, text_nodes_to_children(content))
+    if isinstance(content, str):
+        return ParentNode(tag, [LeafNode(content, item_tag)])
+    return ParentNode(tag, [ParentNode(item_tag, text_nodes_to_children(item)) for item in content])
+
+
+def parsed_block_to_html(parsed: ParsedBlock) -> str:
+    # Same HTML as parsed_block_to_html_node(parsed).to_html(), rendering the
+    # TextNodes straight to strings instead of building a LeafNode for each
+    tag, item_tag, content = parsed
+    if item_tag is None:
+        inner = text_nodes_html(content)
+        with instrument.stage("to_html"):
+            return f"<{tag}>{inner}</{tag}>"
+    if isinstance(content, str):
+        with instrument.stage("to_html"):
+            return f"<{tag}><{item_tag}>{escape_text(content)}</{item_tag}></{tag}>"
+    items = [text_nodes_html(item) for item in content]
+    with instrument.stage("to_html"):
+        inner = "".join(f"<{item_tag}>{item}</{item_tag}>" for item in items)
+        return f"<{tag}>{inner}</{tag}>"
+
+
+def block_to_html_node(block: Block, targets: Optional[list] = None) -> HTMLNode:
+    return parsed_block_to_html_node(parse_block(block, targets))
+
+
+def parse_markdown(markdown: str, targets: Optional[list] = None) -> List[ParsedBlock]:
+    return [
+        parse_block(block, targets)
+        for block in instrument.timed_iter("block_parse", iter_blocks(io.StringIO(markdown)))
+    ]
+
+
+def parsed_to_html(parsed: Iterable[ParsedBlock]) -> str:
+    return f"<div>{''.join(parsed_block_to_html(block) for block in parsed)}</div>"
+
+
+def iter_html_nodes(lines: Iterable[str], targets: Optional[list] = None) -> Iterable[HTMLNode]:
+    for block in instrument.timed_iter("block_parse", iter_blocks(lines)):
+        yield block_to_html_node(block, targets)
+
+
+def markdown_to_html_node(markdown: str) -> ParentNode:
+    return ParentNode("div", list(iter_html_nodes(io.StringIO(markdown))) or [LeafNode("", None)])
+
+
+def markdown_to_html(markdown: str, targets: Optional[list] = None) -> str:
+    # Like every document API, wraps the blocks in one <div>, including for
+    # an empty document ("<div></div>")
+    blocks = "".join(
+        parsed_block_to_html(parse_block(block, targets))
+        for block in instrument.timed_iter("block_parse", iter_blocks(io.StringIO(markdown)))
+    )
+    return f"<div>{blocks}</div>"
+
+
+def iter_markdown_file_html(path: str, targets: Optional[list] = None) -> Iterator[str]:
+    # markdown_to_html of a file, one block at a time: neither the markdown
+    # nor the HTML of the whole document is ever held in memory at once.
+    yield "<div>"
+    for block in instrument.timed_iter("block_parse", iter_file_blocks(path)):
+        yield parsed_block_to_html(parse_block(block, targets))
+    yield "</div>"
+
+
+def write_markdown_file(path: str, fp) -> None:
+    fp.writelines(iter_markdown_file_html(path))
+
+
+def _first_h1(lines: Iterable[str]) -> str:
+    for line in lines:
+        if line.startswith("# "):
+            return line[2:].strip()
+    raise ValueError("No h1 header found in markdown")
+
+
+def extract_title(markdown: str) -> str:
+    return _first_h1(markdown.splitlines())
+
+
+def _plain(title: str) -> str:
+    return "".join(text_node.text for text_node in tokenize_inline(title))
+
+
+def plain_title(markdown: str) -> str:
+    # The h1 text without inline markup (images contribute their alt text),
+    # for <title>, feeds and listings; it still needs escaping as HTML
+    return _plain(extract_title(markdown))
+
+
+def file_title(path: str) -> str:
+    # plain_title of a file, reading it only up to its h1
+    with open(path, encoding="utf-8") as f:
+        return _plain(_first_h1(f))
+
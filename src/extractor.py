@@ -1,16 +1,44 @@
 import re
-from typing import List
+from typing import Iterator, List, Optional, Tuple
+
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+# Images and links in one pass; group 1 is "!" for an image and "" for a link.
+TARGET_PATTERN = re.compile(r"(!?)\[([^\[\]]*)\]\(([^\(\)]*)\)")
 
 
 def extract_markdown_images(text: str) -> List[tuple]:
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
+    matches = IMAGE_PATTERN.findall(text)
 
     return matches
 
 
 def extract_markdown_links(text: str) -> List[tuple]:
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
+    matches = LINK_PATTERN.findall(text)
 
     return matches
+
+
+def iter_markdown_images(
+    text: str, pos: int = 0, endpos: Optional[int] = None
+) -> Iterator[Tuple[int, int, str, str]]:
+    endpos = len(text) if endpos is None else endpos
+    for match in IMAGE_PATTERN.finditer(text, pos, endpos):
+        yield match.start(), match.end(), match.group(1), match.group(2)
+
+
+def iter_markdown_links(
+    text: str, pos: int = 0, endpos: Optional[int] = None
+) -> Iterator[Tuple[int, int, str, str]]:
+    endpos = len(text) if endpos is None else endpos
+    for match in LINK_PATTERN.finditer(text, pos, endpos):
+        yield match.start(), match.end(), match.group(1), match.group(2)
+
+
+def iter_markdown_targets(
+    text: str, pos: int = 0, endpos: Optional[int] = None
+) -> Iterator[Tuple[int, int, bool, str, str]]:
+    endpos = len(text) if endpos is None else endpos
+    for match in TARGET_PATTERN.finditer(text, pos, endpos):
+        is_image, anchor, url = match.groups()
+        yield match.start(), match.end(), bool(is_image), anchor, url
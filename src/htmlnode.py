@@ -1,21 +1,105 @@
+from functools import lru_cache
+from itertools import chain
+from typing import Iterator
+
 VOID_ELEMENTS = {"img", "input", "br", "hr", "meta", "link", "area", "base", "col", "embed", "source", "track", "wbr"}
 
+# How many fragments ParentNode.iter_html buffers before yielding a chunk
+FLUSH_FRAGMENTS = 1024
+
+
+def _immutable(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is shared and cannot be modified")
+
+
+class _EmptyChildren(list):
+    __slots__ = ()
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+
+class FrozenProps(dict):
+    # A read-only dict for props shared between nodes; it compares and
+    # reprs like a plain dict
+    __slots__ = ()
+    pop = popitem = clear = update = setdefault = _immutable
+    __setitem__ = __delitem__ = __ior__ = _immutable
+
+
+_TEXT_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+_ATTR_ESCAPES = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+)
+
+
+def escape_text(text: str) -> str:
+    # Most text has nothing to escape; `in` checks are far cheaper than translate
+    if "&" in text or "<" in text or ">" in text:
+        return text.translate(_TEXT_ESCAPES)
+    return text
+
+
+@lru_cache(maxsize=4096, typed=True)
+def escape_attr(value) -> str:
+    # Cached because the same href and src values repeat across a site;
+    # typed, so True and 1 (equal as keys) are not served each other's text
+    value = str(value)
+    if "&" in value or "<" in value or ">" in value or '"' in value or "'" in value:
+        return value.translate(_ATTR_ESCAPES)
+    return value
+
+
+# Shared by every node created without children or props, so leaves do not
+# allocate an empty list and dict each. They compare and repr like [] and {}.
+EMPTY_CHILDREN = _EmptyChildren()
+EMPTY_PROPS = FrozenProps()
+
+
+_NO_CHILD = object()
+
+
+def _iter_children(children) -> Iterator:
+    # Lists and tuples are checked for emptiness directly; any other iterable
+    # (e.g. a generator building entries on demand) is peeked at so it is
+    # never materialised just to find out whether it is empty.
+    if isinstance(children, (list, tuple)):
+        if not children:
+            raise ValueError("No children for ParentNode")
+        return iter(children)
+    iterator = iter(children)
+    first = next(iterator, _NO_CHILD)
+    if first is _NO_CHILD:
+        raise ValueError("No children for ParentNode")
+    return chain((first,), iterator)
+
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None) -> None:
         self.tag = tag
         self.value = value
-        self.children = children or []
-        self.props = props or {}
+        self.children = children or EMPTY_CHILDREN
+        self.props = props or EMPTY_PROPS
 
-    def to_html(self):
+    def iter_html(self, escape: bool = True) -> Iterator[str]:
         raise NotImplementedError
 
-    def props_to_html(self):
+    def to_html(self, escape: bool = True) -> str:
+        return "".join(self.iter_html(escape))
+
+    def write_to(self, fp, escape: bool = True) -> None:
+        write = fp.write
+        for fragment in self.iter_html(escape):
+            write(fragment)
+
+    def props_to_html(self, escape: bool = True):
         if not self.props:
             return ""
         output_html = ""
         for key in self.props:
-            output_html += f' {key}="{self.props[key]}"'
+            value = escape_attr(self.props[key]) if escape else self.props[key]
+            output_html += f' {key}="{value}"'
         return output_html
 
     def __repr__(self) -> str:
@@ -23,30 +107,38 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, value, tag, props=None) -> None:
         if value is None:
             raise ValueError("Value is required for LeafNode")
-        super().__init__(tag, value, [], props)
+        super().__init__(tag, value, None, props)
         
 
-    def to_html(self) -> str:
+    def iter_html(self, escape: bool = True) -> Iterator[str]:
+        yield self.to_html(escape)
+
+    def to_html(self, escape: bool = True) -> str:
         if self.value is None:
             raise ValueError("All leaf nodes must have a value")
 
+        value = escape_text(self.value) if escape else self.value
         if self.tag is None:
-            return self.value
+            return value
         
         # Special case for void elements like img
-        props_html = self.props_to_html()
+        props_html = self.props_to_html(escape)
         if self.tag in VOID_ELEMENTS:
             return f"<{self.tag}{props_html}>"
-        return f"<{self.tag}{props_html}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{props_html}>{value}</{self.tag}>"
 
     def __repr__(self) -> str:
         return f"LeafNode(tag={repr(self.tag)}, value={repr(self.value)}, props={repr(self.props)})"
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None) -> None:
         if tag is None:
             raise ValueError("Tag is required for ParentNode")
@@ -54,16 +146,69 @@ class ParentNode(HTMLNode):
         super().__init__(tag, None, children, props)
 
 
-    def to_html(self) -> str:
-        if not self.children:
-            raise ValueError("No children for ParentNode")
-
-        children_html = ""
-        for child in self.children:
-            children_html += child.to_html()
-
-        props_html = self.props_to_html()
-        return f"<{self.tag}{props_html}>{children_html}</{self.tag}>"
+    def iter_html(self, escape: bool = True) -> Iterator[str]:
+        # Walks the tree with an explicit stack of child iterators instead of
+        # recursing, so nesting depth is not bound by the recursion limit.
+        # Plain LeafNodes and prop-less tags are rendered inline rather than
+        # through a method call each. Fragments are buffered and yielded in
+        # chunks of about FLUSH_FRAGMENTS, checked as each element closes and
+        # every FLUSH_FRAGMENTS children, so a flat parent with many leaves
+        # streams too. Children may be any iterable; a generator is consumed
+        # by one render.
+        children = _iter_children(self.children)
+        parts = []
+        emit = parts.append
+        emit(f"<{self.tag}{self.props_to_html(escape)}>")
+        closers = [f"</{self.tag}>"]
+        stack = []
+        countdown = FLUSH_FRAGMENTS
+        while True:
+            for child in children:
+                cls = type(child)
+                if cls is LeafNode:
+                    value = child.value
+                    if value is None:
+                        raise ValueError("All leaf nodes must have a value")
+                    if escape and ("&" in value or "<" in value or ">" in value):
+                        value = value.translate(_TEXT_ESCAPES)
+                    tag = child.tag
+                    if tag is None:
+                        emit(value)
+                    elif child.props or tag in VOID_ELEMENTS:
+                        emit(child.to_html(escape))
+                    else:
+                        emit(f"<{tag}>{value}</{tag}>")
+                elif cls is ParentNode or isinstance(child, ParentNode):
+                    grandchildren = child.children
+                    if type(grandchildren) is list and grandchildren:
+                        grandchildren = iter(grandchildren)
+                    else:
+                        grandchildren = _iter_children(grandchildren)
+                    tag = child.tag
+                    emit(f"<{tag}{child.props_to_html(escape)}>" if child.props else f"<{tag}>")
+                    closers.append(f"</{tag}>")
+                    stack.append(children)
+                    children = grandchildren
+                    break
+                elif isinstance(child, LeafNode):
+                    emit(child.to_html(escape))
+                else:
+                    parts.extend(child.iter_html(escape))
+                countdown -= 1
+                if not countdown:
+                    countdown = FLUSH_FRAGMENTS
+                    if len(parts) >= FLUSH_FRAGMENTS:
+                        yield "".join(parts)
+                        parts.clear()
+            else:
+                emit(closers.pop())
+                if not stack:
+                    break
+                children = stack.pop()
+                if len(parts) >= FLUSH_FRAGMENTS:
+                    yield "".join(parts)
+                    parts.clear()
+        yield "".join(parts)
 
     def __repr__(self) -> str:
         return f"ParentNode(tag={repr(self.tag)}, children={repr(self.children)}, props={repr(self.props)})"
@@ -0,0 +1,151 @@
+import threading
+import time
+from contextlib import nullcontext
+from typing import Iterable, Optional
+
+# Returned by stage() while profiling is off, so an instrumented block costs
+# one function call and a no-op context manager.
+_NULL_STAGE = nullcontext()
+_active = None
+
+
+class StageStats:
+    __slots__ = ("calls", "seconds", "nodes", "bytes")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.seconds = 0.0
+        self.nodes = 0
+        self.bytes = 0
+
+
+class _StageTimer:
+    __slots__ = ("stats", "lock", "start")
+
+    def __init__(self, stats: StageStats, lock) -> None:
+        self.stats = stats
+        self.lock = lock
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            self.stats.seconds += elapsed
+            self.stats.calls += 1
+        return False
+
+
+class Profiler:
+    # Stages may be timed from several threads at once (the async builder
+    # renders and writes on worker threads), so updates take a lock
+    def __init__(self) -> None:
+        self.stages = {}
+        self.documents = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self.stages.setdefault(name, StageStats())
+        return stats
+
+    def stage(self, name: str) -> _StageTimer:
+        return _StageTimer(self._stats(name), self._lock)
+
+    def count(self, name: str, nodes: int = 0, bytes: int = 0) -> None:
+        stats = self._stats(name)
+        with self._lock:
+            stats.nodes += nodes
+            stats.bytes += bytes
+
+    def document(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.documents[name] = seconds
+
+    def slowest(self, limit: int = 5):
+        return sorted(self.documents.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def to_dict(self, limit: int = 5) -> dict:
+        return {
+            "stages": {
+                name: {
+                    "calls": stats.calls,
+                    "seconds": stats.seconds,
+                    "nodes": stats.nodes,
+                    "bytes": stats.bytes,
+                }
+                for name, stats in self.stages.items()
+            },
+            "slowest_documents": [
+                {"document": name, "seconds": seconds} for name, seconds in self.slowest(limit)
+            ],
+        }
+
+    def format_table(self, limit: int = 5) -> str:
+        lines = [f"{'stage':<24} {'calls':>8} {'total ms':>10} {'mean us':>10} {'nodes':>10} {'bytes':>12}"]
+        for name, stats in sorted(self.stages.items(), key=lambda item: item[1].seconds, reverse=True):
+            mean_us = stats.seconds / stats.calls * 1e6 if stats.calls else 0.0
+            lines.append(
+                f"{name:<24} {stats.calls:>8} {stats.seconds * 1000:>10.2f} "
+                f"{mean_us:>10.1f} {stats.nodes:>10} {stats.bytes:>12}"
+            )
+        if self.documents:
+            lines.append("")
+            lines.append("slowest documents:")
+            for name, seconds in self.slowest(limit):
+                lines.append(f"  {seconds * 1000:>10.2f} ms  {name}")
+        return "\n".join(lines)
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    global _active
+    _active = profiler or Profiler()
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def active() -> Optional[Profiler]:
+    return _active
+
+
+def stage(name: str):
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+def count(name: str, nodes: int = 0, bytes: int = 0) -> None:
+    if _active is not None:
+        _active.count(name, nodes, bytes)
+
+
+def document(name: str, seconds: float) -> None:
+    if _active is not None:
+        _active.document(name, seconds)
+
+
+def timed_iter(name: str, iterable: Iterable) -> Iterable:
+    # Charges the time spent producing each item of a lazy iterable to `name`
+    if _active is None:
+        return iterable
+    return _timed_iter(_active, name, iterable)
+
+
+def _timed_iter(profiler: Profiler, name: str, iterable: Iterable):
+    iterator = iter(iterable)
+    while True:
+        with profiler.stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
@@ -0,0 +1,137 @@
+import posixpath
+import re
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Set
+
+BrokenLink = namedtuple("BrokenLink", ["page", "offset", "kind", "url"])
+
+_SCHEME = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+def resolve_target(page_output: str, url: str) -> Optional[str]:
+    # Maps a link or image URL on the page rendered to page_output onto a
+    # path relative to the output root. Returns None for targets the site
+    # does not serve itself (other schemes, protocol-relative URLs and
+    # same-page fragments), and ".." for paths that climb out of the root.
+    if _SCHEME.match(url) or url.startswith("//"):
+        return None
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    if not path:
+        return None
+    if path.startswith("/"):
+        joined = path.lstrip("/")
+    else:
+        joined = posixpath.join(posixpath.dirname(page_output), path)
+    directory = path.endswith("/")
+    target = posixpath.normpath(joined) if joined else "."
+    if target == "..":
+        return target
+    if target.startswith("../"):
+        return ".."
+    if target == ".":
+        return "index.html"
+    return target + "/index.html" if directory else target
+
+
+def _candidates(target: str):
+    # "docs" may be served as "docs", "docs.html" or "docs/index.html"
+    yield target
+    yield target + ".html"
+    yield target + "/index.html"
+
+
+def _target_keys(path: str) -> Iterable[str]:
+    # The inverse of _candidates: every target that `path` can satisfy
+    yield path
+    if path.endswith(".html"):
+        yield path[:-5]
+    if path.endswith("/index.html"):
+        yield path[:-11]
+    elif path == "index.html":
+        yield ""
+
+
+def link_records(page_output: str, targets) -> List[list]:
+    # (offset, kind, url) tuples from the converter, plus the resolved target
+    return [[offset, kind, url, resolve_target(page_output, url)] for offset, kind, url in targets]
+
+
+class LinkIndex:
+    # Every page's manifest entry carries its "links" as
+    # [offset, kind, url, target] and its currently "broken" subset. The
+    # index keeps which pages refer to each target, so a build rechecks only
+    # the pages that were rebuilt plus the pages that link to a file that
+    # appeared or disappeared since the last check. `known` is the output
+    # file set of that check, saved in the manifest so a fresh process
+    # starts from the recorded "broken" lists instead of rechecking all.
+    def __init__(self, known: Optional[Iterable[str]] = None) -> None:
+        self.known = set(known) if known is not None else None
+        self.indexed = False
+        self.referrers: Dict[str, Set[str]] = {}
+        self.page_targets: Dict[str, Set[str]] = {}
+
+    def _forget(self, rel: str) -> None:
+        for target in self.page_targets.pop(rel, ()):
+            pages = self.referrers.get(target)
+            if pages is not None:
+                pages.discard(rel)
+                if not pages:
+                    del self.referrers[target]
+
+    def _remember(self, rel: str, entry: dict) -> None:
+        targets = {link[3] for link in entry.get("links", ()) if link[3] is not None}
+        self.page_targets[rel] = targets
+        for target in targets:
+            self.referrers.setdefault(target, set()).add(rel)
+
+    def _check(self, entry: dict, known: Set[str]) -> None:
+        entry["broken"] = [
+            link[:3] for link in entry.get("links", ())
+            if link[3] is not None and not any(c in known for c in _candidates(link[3]))
+        ]
+
+    def update(self, pages: Dict[str, dict], changed: Iterable[str], known: Set[str]) -> List[str]:
+        # `pages` is the new manifest's pages, `changed` the pages whose
+        # entries were just rewritten, `known` every file in the output.
+        # Returns the pages that were rechecked.
+        if self.indexed:
+            for rel in set(self.page_targets) - set(pages):
+                self._forget(rel)
+            for rel in changed:
+                self._forget(rel)
+                self._remember(rel, pages[rel])
+        else:
+            # Building the referrer index only reads the recorded links
+            self.referrers.clear()
+            self.page_targets.clear()
+            for rel, entry in pages.items():
+                self._remember(rel, entry)
+            self.indexed = True
+
+        if self.known is None:
+            recheck = set(pages)
+        else:
+            recheck = set(changed)
+            recheck.update(rel for rel, entry in pages.items() if "broken" not in entry)
+            for path in known ^ self.known:
+                for key in _target_keys(path):
+                    recheck.update(self.referrers.get(key, ()))
+            recheck &= set(pages)
+
+        for rel in recheck:
+            self._check(pages[rel], known)
+        self.known = set(known)
+        return sorted(recheck)
+
+
+def broken_links(pages: Dict[str, dict]) -> List[BrokenLink]:
+    return [
+        BrokenLink(rel, offset, kind, url)
+        for rel, entry in pages.items()
+        for offset, kind, url in entry.get("broken", ())
+    ]
+
+
+def line_and_column(text: str, offset: int):
+    line = text.count("\n", 0, offset) + 1
+    return line, offset - (text.rfind("\n", 0, offset) + 1) + 1
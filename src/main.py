@@ -1,11 +1,189 @@
-from textnode import TextNode, TextType
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import sys
+import time
 
+import instrument
+import watch
+from async_build import build_site_async
+from build import SiteBuilder, build_site, render_page
+from link_index import line_and_column
 
-def main():
-    sample_node = TextNode("Text for testing", TextType.LINK, "https://www.boot.dev")
 
-    print(sample_node.__repr__())
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Build the static site")
+    parser.add_argument("command", nargs="?", default="build", choices=["build", "watch"])
+    parser.add_argument("--content", default="content", help="markdown source directory")
+    parser.add_argument("--template", default="template.html", help="page template")
+    parser.add_argument("--output", default="public", help="output directory")
+    parser.add_argument("--static", default="static", help="static asset directory copied into the output")
+    parser.add_argument("--asset-workers", type=int, help="threads used to copy static assets")
+    parser.add_argument("--hardlink-assets", action="store_true", help="hardlink static assets instead of copying")
+    parser.add_argument("--parse-cache", help="cache parsed documents in this directory (e.g. .cache/parse)")
+    parser.add_argument("--base-url", help="site URL; enables sitemap.xml and feed.xml")
+    parser.add_argument("--site-title", default="Site", help="title of the feed and listing pages")
+    parser.add_argument("--listing-size", type=int, help="generate paginated listing pages with N entries each")
+    parser.add_argument(
+        "--gzip-level", type=int, choices=range(10), metavar="0-9", help="write .gz sidecars at this compression level"
+    )
+    parser.add_argument("--compress-workers", type=int, help="threads used to write .gz sidecars")
+    parser.add_argument("--manifest", help="build manifest path (default: <output>/.manifest.json)")
+    parser.add_argument("--concurrency", type=int, help="build with asyncio, overlapping up to N page reads/writes")
+    parser.add_argument("--host", default="127.0.0.1", help="watch: address to serve the output on")
+    parser.add_argument("--port", type=int, default=8000, help="watch: port to serve the output on")
+    parser.add_argument("--no-serve", action="store_true", help="watch: rebuild without serving")
+    parser.add_argument("--poll", action="store_true", help="watch: poll instead of using inotify")
+    parser.add_argument("--debounce", type=float, default=50, help="watch: quiet period in ms before rebuilding")
+    parser.add_argument("--profile", action="store_true", help="print per-stage timings")
+    parser.add_argument("--profile-top", type=int, default=5, help="slowest documents to report")
+    parser.add_argument("--profile-json", help="write the profile as JSON to this file")
+    parser.add_argument("--cprofile", help="directory for cProfile dumps of the slowest documents")
+    return parser.parse_args(argv)
+
+
+def cprofile_documents(args, documents):
+    # Re-renders each document under cProfile; the build itself stays unprofiled
+    os.makedirs(args.cprofile, exist_ok=True)
+    with open(args.template, encoding="utf-8") as f:
+        template = f.read()
+    for rel in documents:
+        with open(os.path.join(args.content, rel), encoding="utf-8") as f:
+            markdown = f.read()
+        profiler = cProfile.Profile()
+        profiler.runcall(render_page, markdown, template)
+        dump = os.path.join(args.cprofile, rel.replace("/", "__") + ".prof")
+        profiler.dump_stats(dump)
+        print(f"cProfile for {rel} written to {dump}")
+
+
+def report_profile(args, profiler):
+    print()
+    print(profiler.format_table(args.profile_top))
+    if args.profile_json:
+        with open(args.profile_json, "w", encoding="utf-8") as f:
+            json.dump(profiler.to_dict(args.profile_top), f, indent=2)
+    if args.cprofile:
+        cprofile_documents(args, [name for name, _ in profiler.slowest(args.profile_top)])
+
+
+def run_watch(args):
+    builder = SiteBuilder(
+        args.content,
+        args.template,
+        args.output,
+        args.manifest,
+        static_dir=args.static,
+        asset_workers=args.asset_workers,
+        hardlink_assets=args.hardlink_assets,
+        parse_cache_dir=args.parse_cache,
+        base_url=args.base_url,
+        site_title=args.site_title,
+        listing_size=args.listing_size,
+        gzip_level=args.gzip_level,
+        compress_workers=args.compress_workers,
+    )
+    start = time.perf_counter()
+    try:
+        result = builder.build()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Build failed: {e}", file=sys.stderr)
+        return 1
+    print(
+        f"Built {len(result.built)} page(s), skipped {result.skipped} "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
+
+    watcher = watch.make_watcher([args.content, args.template, args.static], poll=args.poll)
+    print(f"Watching for changes ({type(watcher).__name__})")
+    server = None
+    if not args.no_serve:
+        server = watch.serve(args.output, args.host, args.port)
+        print(f"Serving {args.output} at http://{args.host}:{server.server_address[1]}/")
+    try:
+        watch.watch(builder, watcher, debounce=args.debounce / 1000)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+        if server is not None:
+            server.shutdown()
+    return 0
+
+
+def report_broken(args, broken):
+    sources = {}
+    for link in broken:
+        if link.page not in sources:
+            with open(os.path.join(args.content, link.page), encoding="utf-8") as f:
+                sources[link.page] = f.read()
+        line, column = line_and_column(sources[link.page], link.offset)
+        print(f"Broken {link.kind} in {link.page}:{line}:{column}: {link.url}", file=sys.stderr)
+
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "watch":
+        return run_watch(args)
+    profiling = args.profile or args.profile_json or args.cprofile
+    profiler = instrument.enable() if profiling else None
+
+    options = dict(
+        static_dir=args.static,
+        asset_workers=args.asset_workers,
+        hardlink_assets=args.hardlink_assets,
+        parse_cache_dir=args.parse_cache,
+        base_url=args.base_url,
+        site_title=args.site_title,
+        listing_size=args.listing_size,
+        gzip_level=args.gzip_level,
+        compress_workers=args.compress_workers,
+    )
+    start = time.perf_counter()
+    try:
+        if args.concurrency:
+            result = asyncio.run(build_site_async(
+                args.content, args.template, args.output, args.manifest,
+                concurrency=args.concurrency, **options,
+            ))
+        else:
+            result = build_site(args.content, args.template, args.output, args.manifest, **options)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Build failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        instrument.disable()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(
+        f"Built {len(result.built)} page(s), skipped {result.skipped}, "
+        f"removed {len(result.removed)} in {elapsed_ms:.1f} ms"
+    )
+    if result.writes is not None and (result.writes.written or result.writes.unchanged):
+        print(f"Output files: wrote {len(result.writes.written)}, unchanged {len(result.writes.unchanged)}")
+    if result.assets is not None and any(result.assets):
+        print(
+            f"Assets: copied {len(result.assets.copied)}, skipped {len(result.assets.skipped)}, "
+            f"removed {len(result.assets.removed)}"
+        )
+    if result.generated is not None and (result.generated.written or result.generated.removed):
+        print(
+            f"Generated: wrote {len(result.generated.written)}, skipped {len(result.generated.skipped)}, "
+            f"removed {len(result.generated.removed)}"
+        )
+    if result.compressed is not None and (result.compressed.written or result.compressed.removed):
+        print(
+            f"Compressed: wrote {len(result.compressed.written)}, skipped {len(result.compressed.skipped)}, "
+            f"removed {len(result.compressed.removed)}"
+        )
+    if result.broken:
+        report_broken(args, result.broken)
+    if profiler is not None:
+        report_profile(args, profiler)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
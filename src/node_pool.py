@@ -0,0 +1,110 @@
+import threading
+from collections import OrderedDict, namedtuple
+from typing import Mapping, Optional
+
+from htmlnode import FrozenProps, LeafNode
+
+PoolInfo = namedtuple("PoolInfo", ["props_hits", "props_misses", "node_hits", "node_misses", "props", "nodes"])
+
+
+class FlyweightLeafNode(LeafNode):
+    # A LeafNode shared by every occurrence of the same (value, tag, props).
+    # Its HTML is rendered once per escape mode when it is created, and its
+    # attributes are read-only from then on so that HTML can never go stale.
+    __slots__ = ("_html", "_raw_html")
+
+    def __init__(self, value, tag, props=None) -> None:
+        super().__init__(value, tag, props)
+        self._html = super().to_html(True)
+        # Assigned last: once set, the node is frozen
+        self._raw_html = super().to_html(False)
+
+    def __setattr__(self, name, value) -> None:
+        if hasattr(self, "_raw_html"):
+            raise TypeError("FlyweightLeafNode is shared and cannot be modified")
+        super().__setattr__(name, value)
+
+    def __delattr__(self, name) -> None:
+        raise TypeError("FlyweightLeafNode is shared and cannot be modified")
+
+    def to_html(self, escape: bool = True) -> str:
+        return self._html if escape else self._raw_html
+
+
+class NodePool:
+    # Interns props mappings and leaf nodes. Each table keeps at most
+    # `maxsize` entries and evicts the least recently used one beyond that.
+    # Safe to share between threads, e.g. the async builder's render workers.
+    def __init__(self, maxsize: int = 65536) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._props = OrderedDict()
+        self._nodes = OrderedDict()
+        self.props_hits = 0
+        self.props_misses = 0
+        self.node_hits = 0
+        self.node_misses = 0
+
+    def props(self, props: Mapping[str, str]) -> Mapping[str, str]:
+        # Returns a shared read-only dict equal to `props`
+        with self._lock:
+            return self._intern_props(props)
+
+    def _intern_props(self, props: Mapping[str, str]) -> Mapping[str, str]:
+        key = tuple(props.items())
+        shared = self._props.get(key)
+        if shared is not None:
+            self.props_hits += 1
+            self._props.move_to_end(key)
+            return shared
+        self.props_misses += 1
+        shared = self._props[key] = FrozenProps(props)
+        if len(self._props) > self.maxsize:
+            self._props.popitem(last=False)
+        return shared
+
+    def leaf(self, value: str, tag: Optional[str], props: Optional[Mapping[str, str]] = None) -> LeafNode:
+        with self._lock:
+            return self._intern_leaf(value, tag, props)
+
+    def _intern_leaf(self, value: str, tag: Optional[str], props: Optional[Mapping[str, str]]) -> LeafNode:
+        key = (value, tag, tuple(props.items()) if props else ())
+        node = self._nodes.get(key)
+        if node is not None:
+            self.node_hits += 1
+            self._nodes.move_to_end(key)
+            return node
+        self.node_misses += 1
+        node = self._nodes[key] = FlyweightLeafNode(value, tag, self._intern_props(props) if props else None)
+        if len(self._nodes) > self.maxsize:
+            self._nodes.popitem(last=False)
+        return node
+
+    def info(self) -> PoolInfo:
+        return PoolInfo(
+            self.props_hits, self.props_misses, self.node_hits, self.node_misses,
+            len(self._props), len(self._nodes),
+        )
+
+    def format_info(self) -> str:
+        info = self.info()
+        lookups = info.node_hits + info.node_misses
+        rate = info.node_hits / lookups * 100 if lookups else 0.0
+        return (
+            f"node pool: {info.nodes} nodes, {info.props} props, "
+            f"{info.node_hits}/{lookups} node hits ({rate:.1f}%)"
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._props.clear()
+            self._nodes.clear()
+            self.props_hits = self.props_misses = self.node_hits = self.node_misses = 0
+
+
+# Shared by the converter's node-building API (iter_html_nodes,
+# markdown_to_html_node) so repeated links and images are interned across
+# documents; page builds render TextNodes to strings directly and do not
+# use it. LRU eviction keeps a long session from
+# filling it with links that no longer appear.
+DEFAULT_POOL = NodePool()
@@ -1,8 +1,9 @@
-from htmlnode import LeafNode
+from htmlnode import LeafNode, escape_attr, escape_text
 from textnode import TextNode, TextType
 
 
-def text_node_to_html_node(text_node) -> LeafNode:
+def text_node_to_html_node(text_node, pool=None) -> LeafNode:
+    # With a NodePool, links and images come back as shared flyweight nodes
     if not isinstance(text_node, TextNode):
         raise TypeError("Expected a TextNode object")
 
@@ -22,12 +23,83 @@ def text_node_to_html_node(text_node) -> LeafNode:
         case TextType.LINK:
             if text_node.url is None:
                 raise ValueError("URL is required for LINK text type")
+            if pool is not None:
+                return pool.leaf(text_node.text, "a", {"href": text_node.url})
             return LeafNode(text_node.text, "a", {"href": text_node.url})
 
         case TextType.IMAGE:
             if not text_node.url:
                 raise ValueError("URL is required for IMAGE text type")
+            if pool is not None:
+                return pool.leaf("", "img", {"src": text_node.url, "alt": text_node.text})
             return LeafNode("", "img", {"src": text_node.url, "alt": text_node.text})
 
         case _:
             raise ValueError(f"Unsupported TextType: {text_node.text_type}")
+
+
+def _render_text(text_node, escape):
+    return escape_text(text_node.text) if escape else text_node.text
+
+
+def _render_tagged(tag):
+    open_tag, close_tag = f"<{tag}>", f"</{tag}>"
+
+    def render(text_node, escape):
+        text = escape_text(text_node.text) if escape else text_node.text
+        return open_tag + text + close_tag
+    return render
+
+
+def _render_link(text_node, escape):
+    url = text_node.url
+    if url is None:
+        raise ValueError("URL is required for LINK text type")
+    if escape:
+        return f'<a href="{escape_attr(url)}">{escape_text(text_node.text)}</a>'
+    return f'<a href="{url}">{text_node.text}</a>'
+
+
+def _render_image(text_node, escape):
+    url = text_node.url
+    if not url:
+        raise ValueError("URL is required for IMAGE text type")
+    if escape:
+        return f'<img src="{escape_attr(url)}" alt="{escape_attr(text_node.text)}">'
+    return f'<img src="{url}" alt="{text_node.text}">'
+
+
+# Renders a TextNode straight to the HTML its LeafNode would produce
+_RENDERERS = {
+    TextType.TEXT: _render_text,
+    TextType.BOLD: _render_tagged("b"),
+    TextType.ITALIC: _render_tagged("i"),
+    TextType.CODE: _render_tagged("code"),
+    TextType.LINK: _render_link,
+    TextType.IMAGE: _render_image,
+}
+
+
+def _emit_text_nodes(text_nodes, emit, escape):
+    renderers = _RENDERERS
+    for text_node in text_nodes:
+        if not isinstance(text_node, TextNode):
+            raise TypeError("Expected a TextNode object")
+        render = renderers.get(text_node.text_type)
+        if render is None:
+            raise ValueError(f"Unsupported TextType: {text_node.text_type}")
+        emit(render(text_node, escape))
+
+
+def text_nodes_to_html(text_nodes, escape: bool = True) -> str:
+    # Same output as joining text_node_to_html_node(node).to_html(escape),
+    # without building a LeafNode (and props dict) per node
+    parts = []
+    _emit_text_nodes(text_nodes, parts.append, escape)
+    return "".join(parts)
+
+
+def write_text_nodes(text_nodes, fp, escape: bool = True) -> None:
+    # Writes the HTML of each node straight to fp; SpanTextNodes are sliced
+    # only as they are written.
+    _emit_text_nodes(text_nodes, fp.write, escape)
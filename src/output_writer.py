@@ -0,0 +1,102 @@
+import os
+import threading
+from collections import namedtuple
+from typing import Iterable, Optional, Union
+
+_CHUNK = 1 << 16
+
+# Paths written and paths left as they were, over one build
+WriteResult = namedtuple("WriteResult", ["written", "unchanged"])
+
+
+def _same_contents(path: str, data: bytes) -> bool:
+    view = memoryview(data)
+    position = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(_CHUNK):
+            if view[position:position + len(chunk)] != chunk:
+                return False
+            position += len(chunk)
+    return position == len(data)
+
+
+def write_atomic(path: str, data: Union[bytes, Iterable[str]]) -> None:
+    # Readers (a web server, rsync) see either the old file or the new one,
+    # never a partial write. The temporary name is unique per thread so
+    # concurrent writers cannot clobber each other's temporary file.
+    # `data` is bytes, or str chunks streamed to the file as UTF-8.
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+    try:
+        if isinstance(data, bytes):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class OutputWriter:
+    # Writes a file only when its bytes differ from what is on disk, so
+    # unchanged outputs keep their mtime and are not re-synced downstream.
+    # A file of a different size has changed. For one of the same size, the
+    # digest recorded by the previous build is trusted as long as the file
+    # has not been modified since that record was saved (`recorded_ns`, the
+    # manifest's mtime; None trusts it unconditionally); otherwise the file
+    # is compared byte for byte, so an edit made outside the build is repaired.
+    def __init__(self, recorded_ns: Optional[int] = None) -> None:
+        self.recorded_ns = recorded_ns
+        self.written = []
+        self.unchanged = []
+
+    def _recorded(self, st: os.stat_result) -> bool:
+        return self.recorded_ns is None or st.st_mtime_ns <= self.recorded_ns
+
+    def current(self, path: str) -> bool:
+        # Whether the file exists as the previous build left it
+        try:
+            return self._recorded(os.stat(path))
+        except FileNotFoundError:
+            return False
+
+    def write(
+        self,
+        path: str,
+        data: bytes,
+        digest: Optional[str] = None,
+        previous_digest: Optional[str] = None,
+    ) -> bool:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            st = None
+        if st is not None and st.st_size == len(data):
+            if digest is not None and previous_digest is not None and self._recorded(st):
+                same = digest == previous_digest
+            else:
+                same = _same_contents(path, data)
+            if same:
+                self.unchanged.append(path)
+                return False
+        write_atomic(path, data)
+        self.written.append(path)
+        return True
+
+    def write_stream(self, path: str, chunks: Iterable[str]) -> None:
+        # For content the caller already knows has changed
+        write_atomic(path, chunks)
+        self.written.append(path)
+
+    def wrote(self, path: str) -> None:
+        # For a file written elsewhere, e.g. by a worker process
+        self.written.append(path)
+
+    def result(self) -> WriteResult:
+        return WriteResult(self.written, self.unchanged)
@@ -0,0 +1,190 @@
+import marshal
+import os
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from typing import List, Optional, Tuple
+
+import instrument
+from converter import ParsedBlock, parse_markdown
+from textnode import TextNode, TextType
+
+# Bump whenever parsing can produce different ParsedBlocks for the same
+# markdown, so entries written by older parsers are never read back.
+PARSER_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+SUFFIX = ".parse"
+
+ParseCacheInfo = namedtuple("ParseCacheInfo", ["hits", "misses", "evicted"])
+
+_TEXT_TYPES = {text_type.value: text_type for text_type in TextType}
+# Temporary files older than this were left behind by a crashed writer
+_STALE_TMP_SECONDS = 3600
+
+
+def _encode_nodes(nodes) -> tuple:
+    return tuple((node.text, node.text_type.value, node.url) for node in nodes)
+
+
+def _decode_nodes(nodes) -> List[TextNode]:
+    return [TextNode(text, _TEXT_TYPES[text_type], url) for text, text_type, url in nodes]
+
+
+def encode(parsed: List[ParsedBlock], targets: list) -> bytes:
+    # Plain tuples of str/None only, so marshal can store them compactly and
+    # loading never runs arbitrary code the way unpickling could.
+    blocks = []
+    for tag, item_tag, content in parsed:
+        if item_tag is None:
+            content = _encode_nodes(content)
+        elif not isinstance(content, str):
+            content = tuple(_encode_nodes(item) for item in content)
+        blocks.append((tag, item_tag, content))
+    return marshal.dumps((tuple(blocks), tuple(tuple(target) for target in targets)))
+
+
+def decode(data: bytes) -> Tuple[List[ParsedBlock], list]:
+    blocks, targets = marshal.loads(data)
+    parsed = []
+    for tag, item_tag, content in blocks:
+        if item_tag is None:
+            content = _decode_nodes(content)
+        elif not isinstance(content, str):
+            content = [_decode_nodes(item) for item in content]
+        parsed.append(ParsedBlock(tag, item_tag, content))
+    return parsed, list(targets)
+
+
+class ParseCache:
+    # One file per document, named after its content hash, the parser
+    # version and the marshal format. Entries are written to a temporary
+    # file and renamed into place, so concurrent builds sharing the
+    # directory only ever see complete entries; a read counts as a use and
+    # refreshes the entry's mtime, which eviction treats as last access.
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._size = None
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(
+            self.directory,
+            f"{digest}-v{PARSER_VERSION}-m{marshal.version}-py{sys.version_info[0]}{sys.version_info[1]}{SUFFIX}",
+        )
+
+    def get(self, digest: str) -> Optional[Tuple[List[ParsedBlock], list]]:
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                entry = decode(f.read())
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (EOFError, ValueError, TypeError, KeyError):
+            # A damaged entry is dropped and treated as a miss
+            self._remove(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since the read; the entry is still good
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, digest: str, parsed: List[ParsedBlock], targets: list) -> None:
+        data = encode(parsed, targets)
+        if len(data) > self.max_bytes:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(digest))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+
+        if self._size is None:
+            self._size = self._scan()[0]
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            # Another process got there first
+            return False
+        return True
+
+    def _scan(self):
+        total = 0
+        entries = []
+        now = time.time()
+        try:
+            scanned = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0, entries
+        for entry in scanned:
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(SUFFIX):
+                total += st.st_size
+                entries.append((st.st_mtime_ns, st.st_size, entry.path))
+            elif entry.name.endswith(".tmp") and now - st.st_mtime > _STALE_TMP_SECONDS:
+                self._remove(entry.path)
+        return total, entries
+
+    def evict(self) -> None:
+        # Drops least recently used entries until the cache is back under
+        # 80% of max_bytes, so eviction does not run on every write
+        total, entries = self._scan()
+        entries.sort()
+        target = self.max_bytes * 0.8
+        for mtime_ns, size, path in entries:
+            if total <= target:
+                break
+            if self._remove(path):
+                self.evicted += 1
+            total -= size
+        self._size = total
+
+    def clear(self) -> None:
+        for mtime_ns, size, path in self._scan()[1]:
+            self._remove(path)
+        self._size = 0
+
+    def info(self) -> ParseCacheInfo:
+        return ParseCacheInfo(self.hits, self.misses, self.evicted)
+
+
+def parse_markdown_cached(
+    cache: Optional[ParseCache], digest: str, markdown: str, targets: Optional[list] = None
+) -> List[ParsedBlock]:
+    if cache is None:
+        return parse_markdown(markdown, targets)
+    with instrument.stage("parse_cache"):
+        entry = cache.get(digest)
+    if entry is not None:
+        parsed, found = entry
+        instrument.count("parse_cache_hit", nodes=1)
+    else:
+        found = []
+        parsed = parse_markdown(markdown, found)
+        with instrument.stage("parse_cache"):
+            cache.put(digest, parsed, found)
+        instrument.count("parse_cache_miss", nodes=1)
+    if targets is not None:
+        targets.extend(found)
+    return parsed
@@ -0,0 +1,110 @@
+import hashlib
+from collections import OrderedDict, namedtuple
+from typing import Optional
+
+from htmlnode import HTMLNode, ParentNode
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+def subtree_digest(node: HTMLNode, digests=None) -> Optional[bytes]:
+    # Structural hash of (type, tag, value, props, children), computed
+    # bottom-up with an explicit stack so depth is not bound by the recursion
+    # limit. When `digests` is given it is filled with id(node) -> digest for
+    # every node in the subtree, so a render can look subtrees up without
+    # rehashing them; it is only valid while the tree is alive and unchanged.
+    # Lazy (non list/tuple) children cannot be hashed without consuming them,
+    # so a subtree containing any has no digest (None) and is never cached.
+    if digests is None:
+        digests = {}
+    stack = [(node, False)]
+    while stack:
+        current, expanded = stack.pop()
+        if id(current) in digests:
+            # A node shared by several parents is hashed once
+            continue
+        children = current.children
+        if not isinstance(children, (list, tuple)):
+            digests[id(current)] = None
+            continue
+        if not expanded and children:
+            stack.append((current, True))
+            stack.extend((child, False) for child in children)
+            continue
+        h = hashlib.blake2b(digest_size=16)
+        h.update(repr((type(current).__name__, current.tag, current.value, tuple(current.props.items()))).encode())
+        cacheable = True
+        for child in children:
+            child_digest = digests[id(child)]
+            if child_digest is None:
+                cacheable = False
+                break
+            h.update(child_digest)
+        digests[id(current)] = h.digest() if cacheable else None
+    return digests[id(node)]
+
+
+class RenderCache:
+    # Caches the HTML of fully materialised ParentNode subtrees by structural
+    # digest. Digests are recomputed on every render rather than stored on or
+    # for the nodes, so mutating a node between renders can never serve stale
+    # HTML, and the cache keeps no node alive.
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def _enter(self, node, digests, escape, stack) -> Optional[str]:
+        # The node's HTML if it can be produced without visiting its
+        # children; otherwise pushes a frame for it and returns None
+        if not isinstance(node, ParentNode) or not isinstance(node.children, (list, tuple)):
+            return node.to_html(escape)
+        if not node.children:
+            raise ValueError("No children for ParentNode")
+
+        key = None
+        digest = digests.get(id(node))
+        if digest is not None:
+            key = (digest, escape)
+            html = self._entries.get(key)
+            if html is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return html
+            self.misses += 1
+        stack.append((node, key, iter(node.children), []))
+        return None
+
+    def render(self, node: HTMLNode, escape: bool = True) -> str:
+        digests = {}
+        subtree_digest(node, digests)
+        stack = []
+        html = self._enter(node, digests, escape, stack)
+        while stack:
+            current, key, children, parts = stack[-1]
+            for child in children:
+                child_html = self._enter(child, digests, escape, stack)
+                if child_html is None:
+                    break
+                parts.append(child_html)
+            else:
+                stack.pop()
+                html = f"<{current.tag}{current.props_to_html(escape)}>{''.join(parts)}</{current.tag}>"
+                if key is not None:
+                    self._entries[key] = html
+                    if len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                if stack:
+                    stack[-1][3].append(html)
+        return html
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+class SiteTestCase(unittest.TestCase):
+    # Shared fixture for tests that build a site: a temporary directory
+    # (`root`) with content/, static/ and public/ paths and a template file
+    # written from `template_source`. Subclasses add their pages in setUp
+    # after calling super().setUp().
+    template_source = TEMPLATE
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.root = self._tmp.name
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.output = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, self.template_source)
+
+    def write(self, path, data):
+        # str is written as UTF-8, bytes as they are
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if isinstance(data, bytes):
+            with open(path, "wb") as f:
+                f.write(data)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(data)
+
+    def read_output(self, rel):
+        with open(os.path.join(self.output, rel), encoding="utf-8") as f:
+            return f.read()
@@ -0,0 +1,211 @@
+import hashlib
+import heapq
+import os
+from collections import namedtuple
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from itertools import islice
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from assets import remove_output
+from htmlnode import LeafNode, ParentNode, escape_attr, escape_text
+from output_writer import OutputWriter
+from template import Template
+
+# The sitemap protocol caps a single sitemap file at 50,000 URLs
+SITEMAP_LIMIT = 50_000
+FEED_SIZE = 20
+LISTING_DIR = "pages"
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+GenerateResult = namedtuple("GenerateResult", ["written", "skipped", "removed"])
+
+
+def page_url(base_url: str, output: str) -> str:
+    # "blog/index.html" is served as "blog/"
+    if output == "index.html":
+        output = ""
+    elif output.endswith("/index.html"):
+        output = output[:-len("index.html")]
+    return f"{base_url.rstrip('/')}/{quote(output)}"
+
+
+def _mtime(entry: dict) -> datetime:
+    return datetime.fromtimestamp(entry["mtime_ns"] / 1e9, timezone.utc)
+
+
+def _digest(parts: Iterable[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class Generator:
+    # Writes generated files whose digest differs from the one recorded by
+    # the previous build; `digests` becomes the manifest's "generated" entry.
+    # Files go through `writer`, which a build shares with its pages;
+    # emitting a path in `reserved` (the content pages' outputs) is an error.
+    def __init__(
+        self,
+        output_dir: str,
+        previous: Optional[Dict[str, str]] = None,
+        writer: Optional[OutputWriter] = None,
+        reserved: Iterable[str] = (),
+    ) -> None:
+        self.output_dir = output_dir
+        self.previous = previous or {}
+        self.reserved = frozenset(reserved)
+        self.writer = writer or OutputWriter()
+        self.digests = {}
+        self.written = []
+        self.skipped = []
+
+    def emit(self, rel: str, digest: str, render) -> None:
+        # render() returns the file's content as an iterable of str chunks;
+        # it is only called when the file has to be rewritten
+        if rel in self.reserved:
+            raise ValueError(f"Generated file {rel} would overwrite a content page's output")
+        self.digests[rel] = digest
+        path = os.path.join(self.output_dir, rel)
+        if self.previous.get(rel) == digest and self.writer.current(path):
+            self.writer.unchanged.append(path)
+            self.skipped.append(rel)
+            return
+        self.writer.write_stream(path, render())
+        self.written.append(rel)
+
+    def finish(self) -> GenerateResult:
+        removed = sorted(set(self.previous) - set(self.digests))
+        for rel in removed:
+            remove_output(self.output_dir, rel)
+        return GenerateResult(self.written, self.skipped, removed)
+
+
+def _chunks(pages: Dict[str, dict], size: int) -> Iterator[list]:
+    # Consecutive runs of `size` entries; only one run is held at a time
+    entries = iter(pages.values())
+    while chunk := list(islice(entries, size)):
+        yield chunk
+
+
+def _sitemap_entries(base_url: str, entries: Iterable[dict]) -> Iterator[Tuple[str, str]]:
+    for entry in entries:
+        yield page_url(base_url, entry["output"]), _mtime(entry).strftime("%Y-%m-%d")
+
+
+def iter_urlset(base_url: str, entries: Iterable[dict]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'
+    for url, lastmod in _sitemap_entries(base_url, entries):
+        yield f"<url><loc>{escape_attr(url)}</loc><lastmod>{lastmod}</lastmod></url>\n"
+    yield "</urlset>\n"
+
+
+def iter_sitemap_index(base_url: str, shards: Iterable[str]) -> Iterator[str]:
+    yield f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{SITEMAP_NS}">\n'
+    for shard in shards:
+        yield f"<sitemap><loc>{escape_attr(page_url(base_url, shard))}</loc></sitemap>\n"
+    yield "</sitemapindex>\n"
+
+
+def generate_sitemaps(
+    generator: Generator, pages: Dict[str, dict], base_url: str, limit: int = SITEMAP_LIMIT
+) -> None:
+    # Entries are streamed from the manifest shard by shard: once to digest
+    # the shard and, only if the digest changed, again to write it. A site
+    # that fits one shard gets a plain sitemap.xml; larger ones get
+    # sitemap-N.xml shards listed by a sitemap.xml index.
+    count = len(pages)
+    if count <= limit:
+        digest = _digest(part for pair in _sitemap_entries(base_url, pages.values()) for part in pair)
+        generator.emit("sitemap.xml", digest, lambda: iter_urlset(base_url, pages.values()))
+        return
+
+    shards = []
+    for number, chunk in enumerate(_chunks(pages, limit), 1):
+        name = f"sitemap-{number}.xml"
+        digest = _digest(part for pair in _sitemap_entries(base_url, chunk) for part in pair)
+        generator.emit(name, digest, lambda: iter_urlset(base_url, chunk))
+        shards.append(name)
+    generator.emit(
+        "sitemap.xml", _digest([base_url, *shards]), lambda: iter_sitemap_index(base_url, shards)
+    )
+
+
+def iter_feed(base_url: str, title: str, entries: Iterable[dict]) -> Iterator[str]:
+    yield (
+        '<?xml version="1.0" encoding="UTF-8"?>\n<rss version="2.0"><channel>\n'
+        f"<title>{escape_attr(title)}</title><link>{escape_attr(page_url(base_url, ''))}</link>"
+        f"<description>{escape_attr(title)}</description>\n"
+    )
+    for entry in entries:
+        url = escape_attr(page_url(base_url, entry["output"]))
+        yield (
+            f"<item><title>{escape_attr(entry['title'])}</title><link>{url}</link>"
+            f"<guid>{url}</guid><pubDate>{format_datetime(_mtime(entry))}</pubDate></item>\n"
+        )
+    yield "</channel></rss>\n"
+
+
+def generate_feed(
+    generator: Generator, pages: Dict[str, dict], base_url: str, title: str, size: int = FEED_SIZE
+) -> None:
+    # The newest pages by mtime; nlargest keeps only `size` entries in memory.
+    # The digest covers their content rather than mtimes, so touching a
+    # source without changing it does not rewrite the feed.
+    latest = heapq.nlargest(size, pages.values(), key=lambda entry: entry["mtime_ns"])
+    digest = _digest(
+        [base_url, title]
+        + [f"{entry['output']}\0{entry['title']}\0{entry['hash']}" for entry in latest]
+    )
+    generator.emit("feed.xml", digest, lambda: iter_feed(base_url, title, latest))
+
+
+def listing_path(number: int, directory: str = LISTING_DIR) -> str:
+    return f"{directory}/index.html" if number == 1 else f"{directory}/{number}.html"
+
+
+def listing_node(entries: Iterable[dict], number: int, count: int, directory: str = LISTING_DIR) -> ParentNode:
+    # The list items are produced lazily while the page is rendered
+    items = ParentNode("ul", (
+        ParentNode("li", [LeafNode(entry["title"], "a", {"href": "/" + entry["output"]})])
+        for entry in entries
+    ))
+    nav = []
+    if number > 1:
+        nav.append(LeafNode("Previous", "a", {"href": "/" + listing_path(number - 1, directory), "rel": "prev"}))
+    nav.append(LeafNode(f" Page {number} of {count} ", None))
+    if number < count:
+        nav.append(LeafNode("Next", "a", {"href": "/" + listing_path(number + 1, directory), "rel": "next"}))
+    return ParentNode("div", [items, ParentNode("nav", nav)])
+
+
+def generate_listing(
+    generator: Generator,
+    pages: Dict[str, dict],
+    template: Template,
+    size: int,
+    title: str = "Pages",
+    directory: str = LISTING_DIR,
+) -> None:
+    # Paginated index of every page, `size` entries per listing page. Each
+    # listing page's digest covers its entries and the page count (which
+    # changes its navigation), so an edit only rewrites the affected pages.
+    count = -(-len(pages) // size)
+    template_key = _digest(template.segments + template.names)
+    for number, chunk in enumerate(_chunks(pages, size), 1):
+        page_title = title if count == 1 else f"{title} ({number}/{count})"
+        digest = _digest(
+            [template_key, page_title, str(count), *(f"{e['output']}\0{e['title']}" for e in chunk)]
+        )
+        generator.emit(
+            listing_path(number, directory),
+            digest,
+            lambda: template.iter_parts({
+                "Title": escape_text(page_title),
+                "Content": listing_node(chunk, number, count, directory),
+            }),
+        )
@@ -1,6 +1,106 @@
+import re
 from typing import List
-from textnode import TextNode, TextType
-from extractor import extract_markdown_images, extract_markdown_links
+from textnode import SpanTextNode, TextNode, TextType
+from extractor import (
+    IMAGE_PATTERN,
+    LINK_PATTERN,
+    iter_markdown_images,
+    iter_markdown_links,
+    iter_markdown_targets,
+)
+
+
+class InlineSyntaxError(ValueError):
+    def __init__(self, message: str, offset: int) -> None:
+        super().__init__(f"{message} (at offset {offset})")
+        self.message = message
+        self.offset = offset
+
+    def __reduce__(self):
+        # Rebuilt from both fields when sent back from a worker process
+        return type(self), (self.message, self.offset)
+
+
+INLINE_DELIMITERS = {
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
+_INLINE_START = re.compile(r"\*\*|_|`|!?\[")
+
+
+def _node_factory(source: str, spans: bool):
+    # Builds nodes for source[start:end], either as sliced TextNodes or as
+    # SpanTextNodes that keep pointing into the source
+    if spans:
+        return lambda start, end, text_type, url=None: SpanTextNode(
+            source, start, end, text_type, url
+        )
+    return lambda start, end, text_type, url=None: TextNode(
+        source[start:end], text_type, url
+    )
+
+
+def tokenize_inline(text: str, spans: bool = False, on_target=None) -> List[TextNode]:
+    # One left-to-right scan that yields the same nodes as running
+    # split_nodes_delimiter for "**", "_" and "`", then split_nodes_image and
+    # split_nodes_link. Emphasis, code, image and link spans are atomic: any
+    # markup nested inside an emphasis span is kept as literal text of the
+    # outer span instead of being rejected as unbalanced.
+    # on_target(offset, text_type, url) is called for every image and link,
+    # with the offset of its opening "![" or "[" in text.
+    make = _node_factory(text, spans)
+    nodes = []
+    length = len(text)
+    text_start = 0
+    pos = 0
+
+    while pos < length:
+        match = _INLINE_START.search(text, pos)
+        if match is None:
+            break
+
+        start = match.start()
+        token = match.group()
+
+        if token in INLINE_DELIMITERS:
+            content_start = match.end()
+            close = text.find(token, content_start)
+            if close == -1:
+                raise InlineSyntaxError(
+                    f"Invalid markdown, formatted section {token!r} not closed",
+                    start,
+                )
+            if start > text_start:
+                nodes.append(make(text_start, start, TextType.TEXT))
+            if close > content_start:
+                nodes.append(make(content_start, close, INLINE_DELIMITERS[token]))
+            pos = text_start = close + len(token)
+            continue
+
+        if token == "![":
+            target = IMAGE_PATTERN.match(text, start)
+            text_type = TextType.IMAGE
+        else:
+            target = LINK_PATTERN.match(text, start)
+            text_type = TextType.LINK
+
+        if target is None:
+            pos = start + 1
+            continue
+
+        if start > text_start:
+            nodes.append(make(text_start, start, TextType.TEXT))
+        nodes.append(make(target.start(1), target.end(1), text_type, target.group(2)))
+        if on_target is not None:
+            on_target(start, text_type, target.group(2))
+        pos = text_start = target.end()
+
+    if text_start < length:
+        nodes.append(make(text_start, length, TextType.TEXT))
+
+    return nodes
 
 
 def split_nodes_delimiter(
@@ -13,6 +113,10 @@ def split_nodes_delimiter(
             new_nodes.append(old_node)
             continue
 
+        if isinstance(old_node, SpanTextNode):
+            new_nodes.extend(_split_span_delimiter(old_node, delimiter, text_type))
+            continue
+
         sections = old_node.text.split(delimiter)
 
         if len(sections) % 2 == 0:
@@ -30,55 +134,79 @@ def split_nodes_delimiter(
     return new_nodes
 
 
-def split_nodes_image(old_nodes):
+def _split_span_delimiter(node, delimiter, text_type):
+    # split_nodes_delimiter for a SpanTextNode: finds the delimiters inside
+    # the node's span of the source without slicing out any sections
+    source, pos, end = node.source, node.start, node.end
+    bounds = []
+    while True:
+        found = source.find(delimiter, pos, end)
+        if found == -1:
+            bounds.append((pos, end))
+            break
+        bounds.append((pos, found))
+        pos = found + len(delimiter)
+
+    if len(bounds) % 2 == 0:
+        raise ValueError("Invalid markdown, formatted section not closed")
+
+    return [
+        SpanTextNode(source, start, stop, text_type if i % 2 else TextType.TEXT)
+        for i, (start, stop) in enumerate(bounds)
+        if stop > start
+    ]
+
+
+def _split_targets(old_nodes, iter_targets):
+    # iter_targets(source, pos, endpos) yields (start, end, text_type, anchor,
+    # url). SpanTextNodes are split into SpanTextNodes over the same source.
     new_nodes = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
-        original_text = old_node.text
-        images = extract_markdown_images(original_text)
-        if len(images) == 0:
+        if isinstance(old_node, SpanTextNode):
+            source, cursor, end = old_node.source, old_node.start, old_node.end
+        else:
+            source, cursor, end = old_node.text, 0, len(old_node.text)
+        make = _node_factory(source, isinstance(old_node, SpanTextNode))
+        first = cursor
+        for start, stop, text_type, anchor, url in iter_targets(source, cursor, end):
+            if start > cursor:
+                new_nodes.append(make(cursor, start, TextType.TEXT))
+            anchor_start = start + (2 if text_type == TextType.IMAGE else 1)
+            new_nodes.append(make(anchor_start, anchor_start + len(anchor), text_type, url))
+            cursor = stop
+        if cursor == first:
             new_nodes.append(old_node)
-            continue
-        for image in images:
-            sections = original_text.split(f"![{image[0]}]({image[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, image section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(
-                TextNode(
-                    image[0],
-                    TextType.IMAGE,
-                    image[1],
-                )
-            )
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
+        elif cursor < end:
+            new_nodes.append(make(cursor, end, TextType.TEXT))
     return new_nodes
 
 
+def _images(source, pos, endpos):
+    for start, end, anchor, url in iter_markdown_images(source, pos, endpos):
+        yield start, end, TextType.IMAGE, anchor, url
+
+
+def _links(source, pos, endpos):
+    for start, end, anchor, url in iter_markdown_links(source, pos, endpos):
+        yield start, end, TextType.LINK, anchor, url
+
+
+def _images_and_links(source, pos, endpos):
+    for start, end, is_image, anchor, url in iter_markdown_targets(source, pos, endpos):
+        yield start, end, TextType.IMAGE if is_image else TextType.LINK, anchor, url
+
+
+def split_nodes_image(old_nodes):
+    return _split_targets(old_nodes, _images)
+
+
 def split_nodes_link(old_nodes):
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        original_text = old_node.text
-        links = extract_markdown_links(original_text)
-        if len(links) == 0:
-            new_nodes.append(old_node)
-            continue
-        for link in links:
-            sections = original_text.split(f"[{link[0]}]({link[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, link section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(TextNode(link[0], TextType.LINK, link[1]))
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
-    return new_nodes
+    return _split_targets(old_nodes, _links)
+
+
+def split_nodes_image_link(old_nodes):
+    # Same result as split_nodes_link(split_nodes_image(old_nodes)), in one pass
+    return _split_targets(old_nodes, _images_and_links)
@@ -0,0 +1,66 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Mapping
+
+from htmlnode import HTMLNode
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (\w+) \}\}")
+
+
+class Template:
+    # Parsed once into the static text between placeholders (`segments`) and
+    # the placeholders themselves (`slots`); len(segments) == len(slots) + 1.
+    # Rendering joins the two, so the page is built in a single copy instead
+    # of one full copy per str.replace.
+    __slots__ = ("segments", "slots")
+
+    def __init__(self, source: str) -> None:
+        self.segments = []
+        self.slots = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.segments.append(source[position:match.start()])
+            self.slots.append((match.group(1), match.group(0)))
+            position = match.end()
+        self.segments.append(source[position:])
+
+    def __repr__(self) -> str:
+        return f"Template(slots={self.names!r})"
+
+    def iter_parts(self, values: Mapping[str, object], escape: bool = True) -> Iterable[str]:
+        # A value may be a str (inserted verbatim), an HTMLNode, or an
+        # iterable of either; placeholders without a value are kept as is.
+        segments = self.segments
+        for index, (name, placeholder) in enumerate(self.slots):
+            yield segments[index]
+            value = values.get(name, placeholder)
+            if isinstance(value, str):
+                yield value
+            elif isinstance(value, HTMLNode):
+                yield from value.iter_html(escape)
+            else:
+                for item in value:
+                    if isinstance(item, str):
+                        yield item
+                    else:
+                        yield from item.iter_html(escape)
+        yield segments[-1]
+
+    def render(self, values: Mapping[str, object], escape: bool = True) -> str:
+        return "".join(self.iter_parts(values, escape))
+
+    def write_to(self, fp, values: Mapping[str, object], escape: bool = True) -> None:
+        write = fp.write
+        for part in self.iter_parts(values, escape):
+            write(part)
+
+    @property
+    def names(self) -> List[str]:
+        return [name for name, _ in self.slots]
+
+
+@lru_cache(maxsize=32)
+def compile_template(source: str) -> Template:
+    # Keyed by the template text, so every page of a build, and every
+    # watch-mode rebuild until the template is edited, shares one Template.
+    return Template(source)
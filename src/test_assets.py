@@ -0,0 +1,109 @@
+import os
+import unittest
+
+from assets import copy_asset, sync_static
+from build import build_site
+from site_test_case import SiteTestCase
+
+
+class TestSyncStatic(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.static, "index.css"), "body { color: red; }")
+        self.write(os.path.join(self.static, "images", "logo.png"), b"\x89PNG" + bytes(range(256)) * 64)
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_copies_all_files(self):
+        result = sync_static(self.static, self.output)
+        self.assertListEqual(["images/logo.png", "index.css"], result.copied)
+        for rel in result.copied:
+            self.assertEqual(
+                self.read(os.path.join(self.static, rel)),
+                self.read(os.path.join(self.output, rel)),
+            )
+
+    def test_copy_preserves_mtime(self):
+        sync_static(self.static, self.output)
+        src = os.stat(os.path.join(self.static, "index.css"))
+        dst = os.stat(os.path.join(self.output, "index.css"))
+        self.assertEqual(src.st_mtime_ns, dst.st_mtime_ns)
+
+    def test_unchanged_files_are_skipped(self):
+        sync_static(self.static, self.output)
+        result = sync_static(self.static, self.output)
+        self.assertListEqual([], result.copied)
+        self.assertListEqual(["images/logo.png", "index.css"], result.skipped)
+
+    def test_changed_file_is_copied(self):
+        sync_static(self.static, self.output)
+        self.write(os.path.join(self.static, "index.css"), "body { color: blue; }")
+        result = sync_static(self.static, self.output)
+        self.assertListEqual(["index.css"], result.copied)
+        self.assertEqual(b"body { color: blue; }", self.read(os.path.join(self.output, "index.css")))
+
+    def test_checksum_skips_touched_file(self):
+        sync_static(self.static, self.output)
+        os.utime(os.path.join(self.static, "index.css"), ns=(0, 10**9))
+        result = sync_static(self.static, self.output, checksum=True)
+        self.assertListEqual([], result.copied)
+        result = sync_static(self.static, self.output)
+        self.assertListEqual([], result.copied)
+
+    def test_prunes_only_previous_assets(self):
+        sync_static(self.static, self.output)
+        self.write(os.path.join(self.output, "page.html"), "<p>built</p>")
+        os.remove(os.path.join(self.static, "images", "logo.png"))
+        result = sync_static(self.static, self.output, previous=["images/logo.png", "index.css"])
+        self.assertListEqual(["images/logo.png"], result.removed)
+        self.assertFalse(os.path.exists(os.path.join(self.output, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.output, "page.html")))
+
+    def test_reserved_paths(self):
+        with self.assertRaises(ValueError):
+            sync_static(self.static, self.output, reserved={"index.css"})
+        self.assertFalse(os.path.exists(os.path.join(self.output, "index.css")))
+        # An asset a page has since taken over is not pruned
+        self.write(os.path.join(self.output, "page.html"), "<p>built</p>")
+        result = sync_static(self.static, self.output, previous=["page.html"], reserved={"page.html"})
+        self.assertListEqual([], result.removed)
+        self.assertTrue(os.path.exists(os.path.join(self.output, "page.html")))
+
+    def test_build_site_rejects_asset_over_page(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHi")
+        self.write(self.template, "{{ Title }}{{ Content }}")
+        self.write(os.path.join(self.static, "index.html"), "<p>static</p>")
+        with self.assertRaises(ValueError):
+            build_site(self.content, self.template, self.output, static_dir=self.static)
+
+    def test_hardlink(self):
+        sync_static(self.static, self.output, hardlink=True)
+        src = os.stat(os.path.join(self.static, "index.css"))
+        dst = os.stat(os.path.join(self.output, "index.css"))
+        self.assertEqual(src.st_ino, dst.st_ino)
+
+    def test_copy_asset_leaves_no_temp_files(self):
+        src = os.path.join(self.static, "images", "logo.png")
+        dst = os.path.join(self.output, "logo.png")
+        copy_asset(src, dst, os.stat(src))
+        self.assertListEqual(["logo.png"], os.listdir(self.output))
+        self.assertEqual(self.read(src), self.read(dst))
+
+    def test_build_site_syncs_and_prunes_assets(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHi")
+        self.write(self.template, "{{ Title }}{{ Content }}")
+
+        result = build_site(self.content, self.template, self.output, static_dir=self.static)
+        self.assertListEqual(["images/logo.png", "index.css"], result.assets.copied)
+
+        os.remove(os.path.join(self.static, "index.css"))
+        result = build_site(self.content, self.template, self.output, static_dir=self.static)
+        self.assertListEqual(["index.css"], result.assets.removed)
+        self.assertFalse(os.path.exists(os.path.join(self.output, "index.css")))
+        self.assertTrue(os.path.exists(os.path.join(self.output, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
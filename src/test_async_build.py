@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import instrument
+from async_build import AsyncSiteBuilder, build_site_async
+from build import build_site
+from site_test_case import TEMPLATE, SiteTestCase
+
+
+class TestAsyncBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(20):
+            self.write(os.path.join(self.content, f"section{i % 3}", f"page{i}.md"), f"# Page {i}\n\nBody **{i}**")
+
+    def read_tree(self, root):
+        files = {}
+        for directory, dirs, names in os.walk(root):
+            for name in names:
+                if name.endswith(".html"):
+                    path = os.path.join(directory, name)
+                    with open(path, encoding="utf-8") as f:
+                        files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def build(self, **kwargs):
+        return asyncio.run(build_site_async(self.content, self.template, self.output, **kwargs))
+
+    def test_profile_matches_sync_build(self):
+        runs = {
+            "sync": lambda: build_site(self.content, self.template, self.output),
+            "async": lambda: self.build(concurrency=4),
+        }
+        stages = {}
+        for name, run in runs.items():
+            profiler = instrument.enable()
+            try:
+                run()
+            finally:
+                instrument.disable()
+            stages[name] = set(profiler.stages)
+            self.assertEqual(20, len(profiler.documents))
+            self.assertEqual(20, profiler.stages["read"].calls)
+            os.remove(os.path.join(self.output, ".manifest.json"))
+        self.assertSetEqual(stages["sync"], stages["async"])
+
+    def test_matches_sync_build(self):
+        result = self.build(concurrency=4)
+        self.assertEqual(20, len(result.built))
+        self.assertListEqual(sorted(result.built), result.built)
+
+        sync_output = os.path.join(self.root, "sync")
+        build_site(self.content, self.template, sync_output)
+        self.assertDictEqual(self.read_tree(sync_output), self.read_tree(self.output))
+
+    def test_incremental(self):
+        self.build()
+        self.write(os.path.join(self.content, "section0", "page0.md"), "# Page 0\n\nEdited")
+        os.remove(os.path.join(self.content, "section1", "page1.md"))
+        result = self.build()
+        self.assertListEqual(["section0/page0.md"], result.built)
+        self.assertListEqual(["section1/page1.md"], result.removed)
+        self.assertEqual(18, result.skipped)
+
+    def test_shares_manifest_with_sync_build(self):
+        self.build()
+        self.assertListEqual([], build_site(self.content, self.template, self.output).built)
+
+    def test_concurrency_one(self):
+        self.assertEqual(20, len(self.build(concurrency=1).built))
+
+    def test_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncSiteBuilder(self.content, self.template, self.output, concurrency=0)
+
+    def test_large_sources_are_streamed(self):
+        self.build()
+        expected = self.read_tree(self.output)
+        self.write(self.template, TEMPLATE + " ")
+        with mock.patch("build.STREAM_BYTES", 0):
+            result = self.build(concurrency=3)
+        self.assertEqual(20, len(result.built))
+        self.assertDictEqual({rel: html + " " for rel, html in expected.items()}, self.read_tree(self.output))
+
+    def test_render_error_propagates(self):
+        self.write(os.path.join(self.content, "untitled.md"), "no title here")
+        with self.assertRaisesRegex(ValueError, "^untitled.md: "):
+            self.build(concurrency=3)
+
+    def test_process_executor(self):
+        with ProcessPoolExecutor(max_workers=2, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = self.build(concurrency=4, executor=executor)
+        self.assertEqual(20, len(result.built))
+        self.assertIn("<b>7</b>", self.read_tree(self.output)[os.path.join("section1", "page7.html")])
+
+
+if __name__ == "__main__":
+    unittest.main()
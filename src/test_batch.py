@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from batch import BatchConversionError, convert_many
+from converter import markdown_to_html
+
+
+class TestConvertMany(unittest.TestCase):
+    def test_results_in_input_order(self):
+        sources = [f"doc **{i}** with [link](/{i})" for i in range(50)]
+        expected = [markdown_to_html(source) for source in sources]
+        self.assertListEqual(expected, convert_many(sources, max_workers=2, chunksize=3))
+
+    def test_single_worker_runs_in_process(self):
+        self.assertListEqual(["<div><p><b>a</b></p></div>", "<div><p><i>b</i></p></div>"], convert_many(["**a**", "_b_"], max_workers=1))
+
+    def test_paths_are_read(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "page.md")
+            path.write_text("a `code` span", encoding="utf-8")
+            self.assertListEqual(
+                ["<div><p>a <code>code</code> span</p></div>", "<div><p>plain</p></div>"],
+                convert_many([path, "plain"], max_workers=2),
+            )
+
+    def test_str_paths_with_flag(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Page")
+            self.assertListEqual(["<div><h1>Page</h1></div>"], convert_many([path], max_workers=1, paths=True))
+
+    def test_failure_reports_document(self):
+        sources = ["fine", "also fine", "broken **bold", "fine"]
+        with self.assertRaises(BatchConversionError) as ctx:
+            convert_many(sources, max_workers=2, chunksize=1)
+        self.assertEqual(ctx.exception.index, 2)
+        self.assertIn("broken **bold", ctx.exception.source)
+        self.assertIn("not closed", ctx.exception.reason)
+
+    def test_missing_path_reports_path(self):
+        missing = Path(tempfile.gettempdir(), "does-not-exist.md")
+        with self.assertRaises(BatchConversionError) as ctx:
+            convert_many(["ok", missing], max_workers=1)
+        self.assertEqual(ctx.exception.source, os.fspath(missing))
+        self.assertIn("FileNotFoundError", ctx.exception.reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from bench_memory import FACTORIES, bytes_per_node
+
+
+class TestBenchMemory(unittest.TestCase):
+    def test_bytes_per_node_is_positive(self):
+        for name, factory in FACTORIES.items():
+            with self.subTest(node=name):
+                self.assertGreater(bytes_per_node(factory, 100), 0)
+
+    def test_leaf_without_props_is_compact(self):
+        # A leaf only pays for its own slots, not for an empty list and dict
+        self.assertLess(bytes_per_node(FACTORIES["LeafNode(b)"], 1000), 100)
+
+    def test_pooled_link_is_shared(self):
+        self.assertLess(
+            bytes_per_node(FACTORIES["LeafNode(a, pooled)"], 1000),
+            bytes_per_node(FACTORIES["LeafNode(a, props)"], 1000) / 10,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import random
+import unittest
+
+from benchmark import TEXT_WORKLOADS, format_report, run_benchmarks
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_generators_are_seeded(self):
+        for name, generate in TEXT_WORKLOADS.items():
+            with self.subTest(workload=name):
+                self.assertEqual(
+                    generate(random.Random(7), 20), generate(random.Random(7), 20)
+                )
+
+    def test_report_is_json_and_comparable(self):
+        report = run_benchmarks(seed=1, size=10, repeat=1)
+        self.assertSetEqual(
+            {
+                "delimiter",
+                "image_link",
+                "leaf_nodes_to_html",
+                "text_nodes_to_html",
+                "text_node_to_html_node",
+                "to_html_unescaped",
+                "to_html",
+            },
+            set(report["results"]["prose"]),
+        )
+        self.assertSetEqual(
+            {"to_html_recursive", "to_html_unescaped", "to_html"},
+            set(report["results"]["wide_tree"]),
+        )
+        self.assertIn("deep_tree", report["results"])
+
+        baseline = json.loads(json.dumps(report))
+        table = format_report(report, baseline)
+        self.assertIn("vs base", table)
+        self.assertIn("huge_paragraph", table)
+
+
+if __name__ == "__main__":
+    unittest.main()
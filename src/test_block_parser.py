@@ -0,0 +1,91 @@
+import io
+import os
+import tempfile
+import unittest
+
+from block_parser import Block, BlockType, block_to_block_type, iter_blocks, iter_file_blocks
+
+
+class TestBlockToBlockType(unittest.TestCase):
+    def test_types(self):
+        self.assertEqual(block_to_block_type("### Heading"), BlockType.HEADING)
+        self.assertEqual(block_to_block_type("####### Too deep"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("```\ncode\n```"), BlockType.CODE)
+        self.assertEqual(block_to_block_type("> a\n>b"), BlockType.QUOTE)
+        self.assertEqual(block_to_block_type("- a\n- b"), BlockType.UNORDERED_LIST)
+        self.assertEqual(block_to_block_type("1. a\n2. b"), BlockType.ORDERED_LIST)
+        self.assertEqual(block_to_block_type("1. a\n3. b"), BlockType.PARAGRAPH)
+        self.assertEqual(block_to_block_type("- a\nb"), BlockType.PARAGRAPH)
+
+
+class TestIterBlocks(unittest.TestCase):
+    def blocks(self, markdown):
+        return list(iter_blocks(io.StringIO(markdown)))
+
+    def test_blocks_and_offsets(self):
+        markdown = (
+            "# Title\n"
+            "\n"
+            "First paragraph\n"
+            "continues here\n"
+            "\n\n"
+            "- one\n"
+            "- two\n"
+        )
+        self.assertListEqual(
+            [
+                Block(BlockType.HEADING, "# Title", 0),
+                Block(BlockType.PARAGRAPH, "First paragraph\ncontinues here", 9),
+                Block(BlockType.UNORDERED_LIST, "- one\n- two", 42),
+            ],
+            self.blocks(markdown),
+        )
+        for block in self.blocks(markdown):
+            self.assertEqual(markdown[block.offset:block.offset + len(block.text)], block.text)
+
+    def test_heading_ends_paragraph(self):
+        self.assertListEqual(
+            [BlockType.PARAGRAPH, BlockType.HEADING, BlockType.PARAGRAPH],
+            [block.block_type for block in self.blocks("text\n## Sub\nmore")],
+        )
+
+    def test_code_fence_keeps_blank_lines(self):
+        blocks = self.blocks("intro\n```\nfirst\n\n# not a heading\n```\nafter")
+        self.assertListEqual(
+            [
+                Block(BlockType.PARAGRAPH, "intro", 0),
+                Block(BlockType.CODE, "```\nfirst\n\n# not a heading\n```", 6),
+                Block(BlockType.PARAGRAPH, "after", 37),
+            ],
+            blocks,
+        )
+
+    def test_unclosed_code_fence_runs_to_end(self):
+        blocks = self.blocks("```\ncode\n\nmore")
+        self.assertListEqual([Block(BlockType.CODE, "```\ncode\n\nmore", 0)], blocks)
+
+    def test_windows_line_endings(self):
+        blocks = self.blocks("a\r\nb\r\n\r\nc")
+        self.assertListEqual(["a\nb", "c"], [block.text for block in blocks])
+
+    def test_blocks_are_lazy(self):
+        def lines():
+            yield "first\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+
+        self.assertEqual(next(iter_blocks(lines())).text, "first")
+
+    def test_iter_file_blocks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Title\n\n> quoted\n")
+            self.assertListEqual(
+                [BlockType.HEADING, BlockType.QUOTE],
+                [block.block_type for block in iter_file_blocks(path)],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import os
+import unittest
+from unittest import mock
+
+from build import MANIFEST_NAME, SiteBuilder, build_site, output_path_for
+from site_test_case import TEMPLATE, SiteTestCase
+
+
+class TestBuildSite(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome **home**")
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nA _post_")
+
+    def build(self):
+        return build_site(self.content, self.template, self.output)
+
+    def test_output_path_for(self):
+        self.assertEqual(output_path_for("blog/post.md"), "blog/post.html")
+
+    def test_first_build_renders_everything(self):
+        result = self.build()
+        self.assertListEqual(["blog/post.md", "index.md"], result.built)
+        self.assertEqual(result.skipped, 0)
+        html = self.read_output("index.html")
+        self.assertIn("<title>Home</title>", html)
+        self.assertIn("<b>home</b>", html)
+        self.assertTrue(os.path.exists(os.path.join(self.output, MANIFEST_NAME)))
+
+    def test_title_is_plain_escaped_text(self):
+        self.write(os.path.join(self.content, "index.md"), "# A <script>x</script> **b**\n\nText")
+        self.build()
+        self.assertIn("<title>A &lt;script&gt;x&lt;/script&gt; b</title>", self.read_output("index.html"))
+
+    def test_unchanged_build_skips(self):
+        self.build()
+        result = self.build()
+        self.assertListEqual([], result.built)
+        self.assertEqual(result.skipped, 2)
+
+    def test_only_changed_page_is_rebuilt(self):
+        self.build()
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post\n\nEdited")
+        result = self.build()
+        self.assertListEqual(["blog/post.md"], result.built)
+        self.assertIn("Edited", self.read_output("blog/post.html"))
+
+    def test_touch_without_change_is_skipped(self):
+        self.build()
+        path = os.path.join(self.content, "index.md")
+        os.utime(path, ns=(0, 0))
+        self.assertListEqual([], self.build().built)
+
+    def test_template_change_rebuilds_all(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(len(self.build().built), 2)
+        self.assertTrue(self.read_output("index.html").startswith("<h1>Home</h1>"))
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        result = self.build()
+        self.assertListEqual(["blog/post.md"], result.removed)
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog")))
+
+    def test_missing_output_is_rebuilt(self):
+        self.build()
+        os.remove(os.path.join(self.output, "index.html"))
+        self.assertListEqual(["index.md"], self.build().built)
+
+    def test_builder_keeps_manifest_warm(self):
+        builder = SiteBuilder(self.content, self.template, self.output)
+        builder.build()
+        self.assertIn("index.md", builder.manifest["pages"])
+        self.assertListEqual([], builder.build().built)
+
+    def test_error_names_page_and_source_position(self):
+        self.write(os.path.join(self.content, "bad.md"), "# Bad\n\n> fine\n> a **b")
+        with self.assertRaisesRegex(ValueError, r"^bad\.md:4:5: .*'\*\*' not closed$"):
+            self.build()
+
+    def test_error_names_page(self):
+        self.write(os.path.join(self.content, "untitled.md"), "no title here")
+        with self.assertRaisesRegex(ValueError, "^untitled.md: No h1"):
+            self.build()
+
+    def test_large_sources_are_streamed(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n> [a](/missing.html)\n\n- x\n- [b](blog/post.html)")
+        builder = SiteBuilder(self.content, self.template, self.output)
+        builder.build()
+        expected = self.read_output("index.html"), builder.manifest["pages"]["index.md"]
+
+        self.write(self.template, TEMPLATE + " ")
+        with mock.patch("build.STREAM_BYTES", 0):
+            streamed = SiteBuilder(self.content, self.template, self.output)
+            result = streamed.build()
+        self.assertListEqual(["blog/post.md", "index.md"], result.built)
+        self.assertEqual(expected[0] + " ", self.read_output("index.html"))
+        entry = streamed.manifest["pages"]["index.md"]
+        self.assertEqual((expected[1]["title"], expected[1]["links"]), (entry["title"], entry["links"]))
+        self.assertEqual(["/missing.html"], [link.url for link in result.broken])
+
+    def test_streamed_error_names_page_and_source_position(self):
+        self.write(os.path.join(self.content, "bad.md"), "# Bad\n\ntext `code")
+        with mock.patch("build.STREAM_BYTES", 0):
+            with self.assertRaisesRegex(ValueError, r"^bad\.md:3:6: "):
+                self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.output, "bad.html")))
+
+    def test_missing_content_dir(self):
+        with self.assertRaises(FileNotFoundError):
+            build_site(os.path.join(self.root, "nope"), self.template, self.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
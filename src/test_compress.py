@@ -0,0 +1,94 @@
+import gzip
+import os
+import unittest
+from unittest import mock
+
+from build import build_site
+from compress import compress_outputs, gzip_bytes
+from site_test_case import SiteTestCase
+
+
+class TestCompress(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_output("index.html", "<p>home</p>" * 50)
+        self.write_output("blog/post.html", "<p>post</p>" * 50)
+
+    def write_output(self, rel, text):
+        self.write(os.path.join(self.output, rel), text)
+
+    def read_gz(self, rel):
+        with gzip.open(os.path.join(self.output, rel + ".gz"), "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def test_gzip_bytes_is_deterministic(self):
+        self.assertEqual(gzip_bytes(b"abc" * 100), gzip_bytes(b"abc" * 100))
+        self.assertEqual(b"abc" * 100, gzip.decompress(gzip_bytes(b"abc" * 100, level=1)))
+
+    def test_writes_sidecars(self):
+        result, recorded = compress_outputs(self.output, {"index.html": "a", "blog/post.html": "b"})
+        self.assertListEqual(["index.html", "blog/post.html"], result.written)
+        self.assertEqual("<p>post</p>" * 50, self.read_gz("blog/post.html"))
+        self.assertEqual({"index.html": "9:a", "blog/post.html": "9:b"}, recorded)
+
+    def test_unchanged_outputs_are_skipped(self):
+        digests = {"index.html": "a", "blog/post.html": "b"}
+        result, recorded = compress_outputs(self.output, digests)
+        self.write_output("index.html", "<p>changed</p>")
+        result, recorded = compress_outputs(self.output, {**digests, "index.html": "c"}, recorded)
+        self.assertListEqual(["index.html"], result.written)
+        self.assertListEqual(["blog/post.html"], result.skipped)
+        self.assertEqual("<p>changed</p>", self.read_gz("index.html"))
+
+    def test_level_change_recompresses(self):
+        digests = {"index.html": "a"}
+        result, recorded = compress_outputs(self.output, digests, level=9)
+        result, recorded = compress_outputs(self.output, digests, recorded, level=1)
+        self.assertListEqual(["index.html"], result.written)
+
+    def test_removed_outputs_drop_sidecars(self):
+        result, recorded = compress_outputs(self.output, {"index.html": "a", "blog/post.html": "b"})
+        os.remove(os.path.join(self.output, "blog", "post.html"))
+        result, recorded = compress_outputs(self.output, {"index.html": "a"}, recorded)
+        self.assertListEqual(["blog/post.html"], result.removed)
+        self.assertFalse(os.path.exists(os.path.join(self.output, "blog")))
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            compress_outputs(self.output, {}, level=10)
+
+    def test_invalid_level_fails_before_building(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHello")
+        with self.assertRaises(ValueError):
+            build_site(self.content, self.template, self.output, gzip_level=12)
+        self.assertEqual("<p>home</p>" * 50, self.read_output("index.html"))
+
+    def test_build_site(self):
+        public = os.path.join(self.root, "site")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHello")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\nUs")
+        self.write(self.template, "{{ Title }}{{ Content }}")
+
+        result = build_site(self.content, self.template, public, gzip_level=6, base_url="https://x.dev")
+        self.assertListEqual(["about.html", "index.html", "sitemap.xml", "feed.xml"], result.compressed.written)
+        with gzip.open(os.path.join(public, "index.html.gz"), "rt") as f:
+            self.assertEqual("Home<div><h1>Home</h1><p>Hello</p></div>", f.read())
+
+        self.write(os.path.join(self.content, "about.md"), "# About\n\nThem")
+        result = build_site(self.content, self.template, public, gzip_level=6, base_url="https://x.dev")
+        self.assertIn("about.html", result.compressed.written)
+        self.assertIn("index.html", result.compressed.skipped)
+
+        result = build_site(self.content, self.template, public)
+        self.assertIsNone(result.compressed)
+        self.assertFalse(os.path.exists(os.path.join(public, "index.html.gz")))
+
+
+    def test_build_site_passes_workers(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHello")
+        with mock.patch("build.compress_outputs", wraps=compress_outputs) as compress:
+            build_site(self.content, self.template, self.output, gzip_level=6, compress_workers=2)
+        self.assertEqual(2, compress.call_args.kwargs["workers"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import io
+import os
+import tempfile
+import unittest
+
+from converter import (
+    extract_title,
+    markdown_to_html,
+    markdown_to_html_node,
+    plain_title,
+    write_markdown_file,
+)
+from split_delimiter import InlineSyntaxError
+
+
+class TestConverter(unittest.TestCase):
+    def test_inline_markdown(self):
+        self.assertEqual(
+            markdown_to_html("Some **bold** and a [link](https://boot.dev)"),
+            '<div><p>Some <b>bold</b> and a <a href="https://boot.dev">link</a></p></div>',
+        )
+
+    def test_matches_node_rendering(self):
+        markdown = (
+            "# T & <u>\n\nSome **b** _i_ `c` [l](/x?a=1&b) ![i](/i.png)\n\n"
+            "- a **b**\n- c\n\n1. x\n2. y\n\n> q [l](/q)\n> r\n\n```\n<code>\n```"
+        )
+        self.assertEqual(markdown_to_html(markdown), markdown_to_html_node(markdown).to_html())
+
+    def test_empty_document(self):
+        self.assertEqual(markdown_to_html(""), "<div></div>")
+        self.assertEqual(markdown_to_html_node("").to_html(), "<div></div>")
+
+    def test_blocks(self):
+        markdown = """# Title _here_
+
+This is **bolded** paragraph
+text in a p
+tag here
+
+> A quote
+> with _style_
+
+- first
+- second `code`
+
+1. one
+2. two
+
+```
+def f():
+    return "**not bold**"
+```
+"""
+        self.assertEqual(
+            markdown_to_html(markdown),
+            "<div><h1>Title <i>here</i></h1>"
+            "<p>This is <b>bolded</b> paragraph\ntext in a p\ntag here</p>"
+            "<blockquote>A quote\nwith <i>style</i></blockquote>"
+            "<ul><li>first</li><li>second <code>code</code></li></ul>"
+            "<ol><li>one</li><li>two</li></ol>"
+            '<pre><code>def f():\n    return "**not bold**"\n</code></pre></div>',
+        )
+
+    def test_markdown_to_html_node(self):
+        node = markdown_to_html_node("## Sub\n\ntext")
+        self.assertEqual(node.to_html(), "<div><h2>Sub</h2><p>text</p></div>")
+
+    def test_write_markdown_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("# Big\n\n" + "para **x**\n\n" * 100)
+            buffer = io.StringIO()
+            write_markdown_file(path, buffer)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(buffer.getvalue(), markdown_to_html(f.read()))
+
+    def test_syntax_error_offset_is_in_source(self):
+        markdown = "# T\n\n- ok\n- a _b"
+        with self.assertRaises(InlineSyntaxError) as ctx:
+            markdown_to_html(markdown)
+        self.assertEqual(markdown.index("_b"), ctx.exception.offset)
+
+    def test_extract_title(self):
+        self.assertEqual(extract_title("intro\n# Hello  \n## Sub"), "Hello")
+
+    def test_plain_title_strips_markup(self):
+        self.assertEqual(plain_title("# A **b** `c` [d](/d) ![e](/e.png)"), "A b c d e")
+
+    def test_extract_title_missing(self):
+        with self.assertRaises(ValueError):
+            extract_title("## Not a title\n#hashtag")
+
+
+if __name__ == "__main__":
+    unittest.main()
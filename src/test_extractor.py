@@ -1,5 +1,11 @@
 from unittest import TestCase
-from extractor import extract_markdown_images, extract_markdown_links
+from extractor import (
+    extract_markdown_images,
+    extract_markdown_links,
+    iter_markdown_images,
+    iter_markdown_links,
+    iter_markdown_targets,
+)
 
 
 class TestExtractor(TestCase):
@@ -92,3 +98,27 @@ class TestExtractor(TestCase):
         
         self.assertListEqual([], extract_markdown_links(text1))
         self.assertListEqual([], extract_markdown_links(text2))
+
+    def test_iter_markdown_images_spans(self):
+        """Test that image spans slice back to the original markdown."""
+        text = "An ![image](https://example.com/img.png) and a [link](https://example.com)"
+        matches = list(iter_markdown_images(text))
+        self.assertListEqual([(3, 40, "image", "https://example.com/img.png")], matches)
+        self.assertEqual(text[3:40], "![image](https://example.com/img.png)")
+
+    def test_iter_markdown_links_spans(self):
+        """Test that link spans skip images and slice back to the markdown."""
+        text = "An ![image](https://example.com/img.png) and a [link](https://example.com)"
+        matches = list(iter_markdown_links(text))
+        self.assertListEqual([(47, 74, "link", "https://example.com")], matches)
+        self.assertEqual(text[47:74], "[link](https://example.com)")
+
+    def test_iter_markdown_targets(self):
+        """Test that images and links come back together in source order."""
+        text = "[a](x) ![b](y) [c](z)"
+        matches = list(iter_markdown_targets(text))
+        self.assertListEqual([
+            (0, 6, False, "a", "x"),
+            (7, 14, True, "b", "y"),
+            (15, 21, False, "c", "z"),
+        ], matches)
@@ -1,6 +1,8 @@
+import io
+import tracemalloc
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, ParentNode, escape_attr, escape_text
 
 
 class TestHTMLNode(unittest.TestCase):
@@ -12,11 +14,21 @@ class TestHTMLNode(unittest.TestCase):
         self.assertEqual(node.children, [])
         self.assertEqual(node.props, {})
 
-        # Test that default collections are different objects
+        # Test that default collections are shared, immutable sentinels
         node1 = HTMLNode()
-        node2 = HTMLNode()
-        self.assertIsNot(node1.children, node2.children)
-        self.assertIsNot(node1.props, node2.props)
+        node2 = LeafNode("text", "p")
+        self.assertIs(node1.children, node2.children)
+        self.assertIs(node1.props, node2.props)
+        self.assertEqual(repr(node1.children), "[]")
+        self.assertEqual(repr(node1.props), "{}")
+        with self.assertRaises(TypeError):
+            node1.children.append(HTMLNode())
+        with self.assertRaises(TypeError):
+            node1.props["class"] = "container"
+
+    def test_nodes_have_no_instance_dict(self):
+        for node in (HTMLNode(), LeafNode("a", "b"), ParentNode("p", [LeafNode("a", None)])):
+            self.assertFalse(hasattr(node, "__dict__"))
 
     def test_init_with_values(self):
         # Test initialization with specific values
@@ -131,6 +143,41 @@ class TestLeafNode(unittest.TestCase):
         self.assertIn("value='Hello'", repr_str)
         self.assertIn("props={'class': 'greeting'}", repr_str)
 
+class TestEscaping(unittest.TestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text("a < b && c > d"), "a &lt; b &amp;&amp; c &gt; d")
+        self.assertEqual(escape_text('say "hi"'), 'say "hi"')
+        plain = "nothing to escape"
+        self.assertIs(escape_text(plain), plain)
+
+    def test_escape_attr(self):
+        self.assertEqual(
+            escape_attr("/search?q=\"x\"&lang='en'<"),
+            "/search?q=&quot;x&quot;&amp;lang=&#x27;en&#x27;&lt;",
+        )
+        self.assertEqual(escape_attr(3), "3")
+        self.assertEqual(escape_attr(1), "1")
+        self.assertEqual(escape_attr(True), "True")
+
+    def test_leaf_escapes_value_and_props(self):
+        node = LeafNode("<script>", "a", {"href": "/?a=1&b=2"})
+        self.assertEqual(node.to_html(), '<a href="/?a=1&amp;b=2">&lt;script&gt;</a>')
+        self.assertEqual(node.to_html(escape=False), '<a href="/?a=1&b=2"><script></a>')
+
+    def test_existing_entities_are_escaped_again(self):
+        node = LeafNode("&amp;", None)
+        self.assertEqual(node.to_html(), "&amp;amp;")
+        self.assertEqual(node.to_html(escape=False), "&amp;")
+
+    def test_parent_escape_option(self):
+        node = ParentNode("p", [LeafNode("1 < 2", None)], {"title": 'a "b"'})
+        self.assertEqual(node.to_html(), '<p title="a &quot;b&quot;">1 &lt; 2</p>')
+        self.assertEqual(node.to_html(escape=False), '<p title="a "b"">1 < 2</p>')
+        buffer = io.StringIO()
+        node.write_to(buffer, escape=False)
+        self.assertEqual(buffer.getvalue(), node.to_html(escape=False))
+
+
 class TestParentNode(unittest.TestCase):
     def test_parent_node_initialization(self):
         # Test basic initialization
@@ -216,5 +263,107 @@ class TestParentNode(unittest.TestCase):
             "<div><strong><em>Deepest content</em></strong></div>"
         )
 
+    def test_iter_html_fragments(self):
+        node = ParentNode("div", [LeafNode("a", "b"), LeafNode(" and ", None)], {"id": "x"})
+        self.assertEqual('<div id="x"><b>a</b> and </div>', "".join(node.iter_html()))
+        self.assertEqual(node.to_html(), "".join(node.iter_html()))
+
+    def test_iter_html_yields_chunks(self):
+        items = [ParentNode("li", [LeafNode(str(i), None)]) for i in range(5000)]
+        chunks = list(ParentNode("ul", items).iter_html())
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue("".join(chunks).endswith("<li>4999</li></ul>"))
+
+    def test_very_deep_tree(self):
+        node = LeafNode("bottom", "span")
+        for _ in range(50_000):
+            node = ParentNode("div", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<div>" * 100))
+        self.assertIn("<span>bottom</span></div>", html)
+        self.assertEqual(len(html), 50_000 * len("<div></div>") + len("<span>bottom</span>"))
+
+    def test_generator_children(self):
+        items = (ParentNode("li", [LeafNode(f"Entry {i}", None)]) for i in range(3))
+        node = ParentNode("ul", items)
+        self.assertEqual(
+            node.to_html(), "<ul><li>Entry 0</li><li>Entry 1</li><li>Entry 2</li></ul>"
+        )
+
+    def test_children_built_on_demand(self):
+        built = []
+
+        def entries():
+            for i in range(3):
+                built.append(i)
+                yield LeafNode(str(i), "li")
+
+        fragments = ParentNode("ol", entries()).iter_html()
+        self.assertListEqual([], built)
+        "".join(fragments)
+        self.assertListEqual([0, 1, 2], built)
+
+    def test_empty_generator_children_raise(self):
+        with self.assertRaises(ValueError):
+            ParentNode("ul", iter(())).to_html()
+        nested = ParentNode("div", [ParentNode("ul", (x for x in ()))])
+        with self.assertRaises(ValueError):
+            nested.to_html()
+
+    def test_lazy_index_page_streams_in_bounded_memory(self):
+        class Sink:
+            def write(self, fragment):
+                pass
+
+        def peak_bytes(count):
+            # Flat leaf entries, the common case for an index page
+            items = (LeafNode(f"Page {i}", "li", {"id": f"page-{i}"}) for i in range(count))
+            escape_attr.cache_clear()
+            tracemalloc.start()
+            try:
+                ParentNode("ul", items).write_to(Sink())
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        # 4x the entries must not mean anywhere near 4x the peak memory (both
+        # sizes are past the escape_attr cache limit)
+        self.assertLess(peak_bytes(40_000), peak_bytes(10_000) * 1.5)
+
+    def test_flat_parent_streams_in_chunks(self):
+        node = ParentNode("ul", [LeafNode(f"Item {i}", "li") for i in range(10_000)])
+        chunks = list(node.iter_html())
+        self.assertGreater(len(chunks), 5)
+        self.assertEqual("".join(chunks), node.to_html())
+
+    def test_matches_recursive_rendering(self):
+        def render(node):
+            if isinstance(node, LeafNode):
+                return node.to_html()
+            inner = "".join(render(child) for child in node.children)
+            return f"<{node.tag}{node.props_to_html()}>{inner}</{node.tag}>"
+
+        tree = ParentNode(
+            "body",
+            [
+                ParentNode("nav", [LeafNode("Home", "a", {"href": "/"})], {"class": "nav"}),
+                ParentNode("main", [ParentNode("p", [LeafNode("x", None), LeafNode("", "img", {"src": "a.png"})])]),
+                LeafNode("Footer", "footer"),
+            ],
+        )
+        self.assertEqual(tree.to_html(), render(tree))
+
+    def test_write_to(self):
+        inner = ParentNode("section", [LeafNode("Inner content", "p")])
+        node = ParentNode("div", [LeafNode("Header", "h1"), inner])
+        buffer = io.StringIO()
+        node.write_to(buffer)
+        self.assertEqual(buffer.getvalue(), node.to_html())
+
+    def test_write_to_empty_children_raises(self):
+        node = ParentNode("div", [ParentNode("p", [])])
+        with self.assertRaises(ValueError):
+            node.write_to(io.StringIO())
+
 if __name__ == "__main__":
     unittest.main()
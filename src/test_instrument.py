@@ -0,0 +1,64 @@
+import unittest
+
+import instrument
+from converter import markdown_to_html
+
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+
+    def test_disabled_is_a_no_op(self):
+        self.assertIsNone(instrument.active())
+        self.assertIs(instrument.stage("a"), instrument.stage("b"))
+        items = [1, 2]
+        self.assertIs(instrument.timed_iter("x", items), items)
+        instrument.count("x", nodes=1)
+        instrument.document("doc", 1.0)
+
+    def test_stage_counts_calls_and_time(self):
+        profiler = instrument.enable()
+        for _ in range(3):
+            with instrument.stage("work"):
+                pass
+        instrument.count("work", nodes=5, bytes=10)
+        stats = profiler.stages["work"]
+        self.assertEqual(stats.calls, 3)
+        self.assertEqual(stats.nodes, 5)
+        self.assertEqual(stats.bytes, 10)
+        self.assertGreaterEqual(stats.seconds, 0)
+        self.assertIs(instrument.disable(), profiler)
+        self.assertIsNone(instrument.active())
+
+    def test_timed_iter(self):
+        profiler = instrument.enable()
+        self.assertListEqual([1, 2, 3], list(instrument.timed_iter("gen", iter([1, 2, 3]))))
+        self.assertEqual(profiler.stages["gen"].calls, 4)
+
+    def test_converter_stages(self):
+        profiler = instrument.enable()
+        markdown_to_html("# Title\n\nSome **bold** text\n\n- a\n- b")
+        self.assertSetEqual(
+            {"block_parse", "tokenize_inline", "text_node_to_html_node", "to_html"},
+            set(profiler.stages),
+        )
+        self.assertEqual(profiler.stages["tokenize_inline"].nodes, 6)
+
+    def test_report(self):
+        profiler = instrument.enable()
+        with instrument.stage("work"):
+            pass
+        instrument.document("slow.md", 2.0)
+        instrument.document("fast.md", 1.0)
+        instrument.document("mid.md", 1.5)
+        self.assertListEqual([("slow.md", 2.0), ("mid.md", 1.5)], profiler.slowest(2))
+        table = profiler.format_table()
+        self.assertIn("work", table)
+        self.assertIn("slow.md", table)
+        data = profiler.to_dict(limit=1)
+        self.assertEqual(data["stages"]["work"]["calls"], 1)
+        self.assertListEqual([{"document": "slow.md", "seconds": 2.0}], data["slowest_documents"])
+
+
+if __name__ == "__main__":
+    unittest.main()
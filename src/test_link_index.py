@@ -0,0 +1,140 @@
+import os
+import unittest
+
+import instrument
+from build import SiteBuilder
+from converter import markdown_to_html
+from link_index import LinkIndex, line_and_column, resolve_target
+from site_test_case import SiteTestCase
+
+
+class TestResolveTarget(unittest.TestCase):
+    def test_external(self):
+        for url in ["https://boot.dev", "mailto:a@b.c", "//cdn.example.com/x.js", "#top", "?q=1"]:
+            with self.subTest(url=url):
+                self.assertIsNone(resolve_target("blog/post.html", url))
+
+    def test_relative_and_absolute(self):
+        self.assertEqual("blog/other.html", resolve_target("blog/post.html", "other.html"))
+        self.assertEqual("about.html", resolve_target("blog/post.html", "../about.html#team"))
+        self.assertEqual("images/logo.png", resolve_target("blog/post.html", "/images/logo.png?v=2"))
+
+    def test_directories(self):
+        self.assertEqual("index.html", resolve_target("blog/post.html", "/"))
+        self.assertEqual("blog/index.html", resolve_target("blog/post.html", "./"))
+        self.assertEqual("docs/index.html", resolve_target("index.html", "docs/"))
+
+    def test_outside_root(self):
+        self.assertEqual("..", resolve_target("blog/post.html", "../../secret"))
+
+
+class TestTargetOffsets(unittest.TestCase):
+    def targets(self, markdown):
+        targets = []
+        markdown_to_html(markdown, targets)
+        for offset, kind, url in targets:
+            prefix = "![" if kind == "image" else "["
+            self.assertTrue(markdown.startswith(prefix, offset), (markdown, offset))
+        return targets
+
+    def test_blocks(self):
+        markdown = (
+            "# Title [home](/)\n\n"
+            "Some [link](/a) and ![img](/b.png)\non two [lines](/c)\n\n"
+            "> quoted [q](/q)\n>[r](/r)\n\n"
+            "- [x](/x)\n- y [z](/z)\n\n"
+            "1. [one](/1)\n2. two [two](/2)\n\n"
+            "```\n[not a link](/code)\n```\n"
+        )
+        urls = [url for _, _, url in self.targets(markdown)]
+        self.assertListEqual(["/", "/a", "/b.png", "/c", "/q", "/r", "/x", "/z", "/1", "/2"], urls)
+
+    def test_kinds(self):
+        self.assertListEqual(
+            [(0, "image", "/i.png"), (15, "link", "/l")],
+            self.targets("![i](/i.png) a [l](/l)"),
+        )
+
+    def test_line_and_column(self):
+        text = "one\ntwo [x](/x)"
+        self.assertEqual((2, 5), line_and_column(text, text.index("[")))
+
+
+class TestLinkCheck(SiteTestCase):
+    template_source = "<title>{{ Title }}</title>{{ Content }}"
+
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[About](about.html) [Blog](blog/) ![logo](/logo.png)")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\n[Home](/) [Post](/blog/post) [Ext](https://boot.dev)")
+        self.write(os.path.join(self.static, "logo.png"), "png")
+        self.builder = SiteBuilder(self.content, self.template, self.output, static_dir=self.static)
+
+    def broken(self, result):
+        return sorted((link.page, link.url) for link in result.broken)
+
+    def test_reports_missing_targets(self):
+        result = self.builder.build()
+        self.assertListEqual([("about.md", "/blog/post"), ("index.md", "blog/")], self.broken(result))
+        offset = result.broken[0].offset
+        with open(os.path.join(self.content, "about.md"), encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith("[Post]", offset))
+
+    def test_new_page_fixes_links(self):
+        self.builder.build()
+        self.write(os.path.join(self.content, "blog", "post.md"), "# Post")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\n[Post](post.html)")
+        result = self.builder.build()
+        self.assertListEqual([], self.broken(result))
+
+    def test_only_affected_pages_are_rechecked(self):
+        self.builder.build()
+        pages = self.builder.manifest["pages"]
+        known = {entry["output"] for entry in pages.values()} | {"logo.png"}
+        index = LinkIndex()
+        self.assertListEqual(["about.md", "index.md"], index.update(pages, [], known))
+        self.assertListEqual([], index.update(pages, [], known))
+        self.assertListEqual(["about.md"], index.update(pages, ["about.md"], known))
+        self.assertListEqual(["index.md"], index.update(pages, [], known - {"logo.png"}))
+        self.assertIn(["image", "/logo.png"], [link[1:] for link in pages["index.md"]["broken"]])
+
+    def test_removed_asset_breaks_image(self):
+        self.builder.build()
+        os.remove(os.path.join(self.static, "logo.png"))
+        result = self.builder.build()
+        self.assertIn(("index.md", "/logo.png"), self.broken(result))
+
+    def test_links_survive_restart(self):
+        self.builder.build()
+        result = SiteBuilder(self.content, self.template, self.output, static_dir=self.static).build()
+        self.assertListEqual([], result.built)
+        self.assertListEqual([("about.md", "/blog/post"), ("index.md", "blog/")], self.broken(result))
+
+    def test_restart_rechecks_only_affected_pages(self):
+        self.builder.build()
+
+        def rechecked():
+            profiler = instrument.enable()
+            try:
+                result = SiteBuilder(self.content, self.template, self.output, static_dir=self.static).build()
+            finally:
+                instrument.disable()
+            return profiler.stages["link_check"].nodes, result
+
+        self.assertEqual(0, rechecked()[0])
+        os.remove(os.path.join(self.static, "logo.png"))
+        count, result = rechecked()
+        self.assertEqual(1, count)
+        self.assertIn(("index.md", "/logo.png"), self.broken(result))
+        self.assertIn(("about.md", "/blog/post"), self.broken(result))
+
+    def test_touched_page_keeps_links(self):
+        self.builder.build()
+        os.utime(os.path.join(self.content, "about.md"), ns=(0, 0))
+        result = self.builder.build()
+        self.assertListEqual([], result.built)
+        self.assertIn(("about.md", "/blog/post"), self.broken(result))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from htmlnode import LeafNode, ParentNode
+from node_pool import FlyweightLeafNode, NodePool
+from node_utils import text_node_to_html_node
+from textnode import TextNode, TextType
+
+
+class TestNodePool(unittest.TestCase):
+    def test_identical_leaves_are_shared(self):
+        pool = NodePool()
+        a = pool.leaf("docs", "a", {"href": "/docs"})
+        b = pool.leaf("docs", "a", {"href": "/docs"})
+        self.assertIs(a, b)
+        self.assertIsInstance(a, FlyweightLeafNode)
+        self.assertIsNot(a, pool.leaf("Docs", "a", {"href": "/docs"}))
+
+    def test_props_are_shared_and_read_only(self):
+        pool = NodePool()
+        a = pool.leaf("one", "a", {"href": "/x"})
+        b = pool.leaf("two", "a", {"href": "/x"})
+        self.assertIs(a.props, b.props)
+        with self.assertRaises(TypeError):
+            a.props["href"] = "/y"
+
+    def test_flyweight_is_read_only(self):
+        node = NodePool().leaf("docs", "a", {"href": "/docs"})
+        for name, value in (("value", "other"), ("tag", "b"), ("props", {})):
+            with self.subTest(name=name), self.assertRaises(TypeError):
+                setattr(node, name, value)
+        self.assertEqual(node.to_html(), '<a href="/docs">docs</a>')
+
+    def test_repr_matches_leaf(self):
+        node = NodePool().leaf("docs", "a", {"href": "/docs"})
+        self.assertEqual(repr(LeafNode("docs", "a", {"href": "/docs"})), repr(node))
+
+    def test_props_order_matters(self):
+        pool = NodePool()
+        a = pool.props({"src": "a.png", "alt": "A"})
+        b = pool.props({"alt": "A", "src": "a.png"})
+        self.assertIsNot(a, b)
+
+    def test_flyweight_renders_like_leaf(self):
+        pool = NodePool()
+        props = {"href": "/a?b=1&c=2"}
+        leaf = LeafNode("x < y", "a", props)
+        node = pool.leaf("x < y", "a", props)
+        for escape in (True, False):
+            with self.subTest(escape=escape):
+                self.assertEqual(leaf.to_html(escape), node.to_html(escape))
+                self.assertEqual(leaf.to_html(escape), node.to_html(escape))
+
+    def test_flyweight_inside_parent(self):
+        pool = NodePool()
+        link = pool.leaf("home", "a", {"href": "/"})
+        parent = ParentNode("p", [link, LeafNode(" and ", None), link])
+        self.assertEqual('<p><a href="/">home</a> and <a href="/">home</a></p>', parent.to_html())
+
+    def test_hit_counts(self):
+        pool = NodePool()
+        for _ in range(3):
+            pool.leaf("logo", "img", {"src": "/logo.png", "alt": "logo"})
+        info = pool.info()
+        self.assertEqual((2, 1), (info.node_hits, info.node_misses))
+        self.assertEqual((1, 1), (info.props, info.nodes))
+        self.assertIn("2/3 node hits", pool.format_info())
+
+    def test_maxsize_bounds_the_pool(self):
+        pool = NodePool(maxsize=2)
+        for i in range(5):
+            pool.leaf(str(i), "a", {"href": f"/{i}"})
+        self.assertEqual(2, pool.info().nodes)
+        self.assertEqual(pool.leaf("4", "a", {"href": "/4"}).to_html(), '<a href="/4">4</a>')
+
+    def test_least_recently_used_is_evicted(self):
+        pool = NodePool(maxsize=2)
+        first = pool.leaf("1", "a", {"href": "/1"})
+        pool.leaf("2", "a", {"href": "/2"})
+        pool.leaf("1", "a", {"href": "/1"})
+        pool.leaf("3", "a", {"href": "/3"})
+        self.assertIs(first, pool.leaf("1", "a", {"href": "/1"}))
+        self.assertEqual(3, pool.info().node_misses)
+
+    def test_shared_between_threads(self):
+        pool = NodePool(maxsize=50)
+
+        def intern(i):
+            return pool.leaf(str(i % 40), "a", {"href": f"/{i % 40}"})
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            nodes = list(executor.map(intern, range(4000)))
+        info = pool.info()
+        self.assertEqual(4000, info.node_hits + info.node_misses)
+        self.assertEqual(40, info.node_misses)
+        self.assertTrue(all(node is nodes[i % 40] for i, node in enumerate(nodes)))
+
+    def test_clear(self):
+        pool = NodePool()
+        pool.leaf("a", "a", {"href": "/"})
+        pool.clear()
+        self.assertEqual((0, 0, 0, 0, 0, 0), tuple(pool.info()))
+
+    def test_text_node_to_html_node_with_pool(self):
+        pool = NodePool()
+        link = TextNode("docs", TextType.LINK, "/docs")
+        image = TextNode("logo", TextType.IMAGE, "/logo.png")
+        self.assertIs(text_node_to_html_node(link, pool), text_node_to_html_node(link, pool))
+        self.assertEqual(
+            text_node_to_html_node(image).to_html(),
+            text_node_to_html_node(image, pool).to_html(),
+        )
+        self.assertNotIsInstance(text_node_to_html_node(TextNode("t", TextType.TEXT), pool), FlyweightLeafNode)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,9 @@
+import io
 import unittest
+from types import SimpleNamespace
 
-from node_utils import text_node_to_html_node
+from node_utils import text_node_to_html_node, text_nodes_to_html, write_text_nodes
+from split_delimiter import tokenize_inline
 from textnode import TextNode, TextType
 
 
@@ -57,6 +60,44 @@ class TestNodeUtils(unittest.TestCase):
         expected_html = '<img src="https://example.com/image.png" alt="Alt text for image">'
         self.assertEqual(html_node.to_html(), expected_html)
 
+    def test_write_text_nodes(self):
+        text = "A **b** _i_ `c` ![img](x.png) [link](https://boot.dev) end"
+        expected = "".join(text_node_to_html_node(node).to_html() for node in tokenize_inline(text))
+        for spans in (False, True):
+            buffer = io.StringIO()
+            write_text_nodes(tokenize_inline(text, spans=spans), buffer)
+            self.assertEqual(buffer.getvalue(), expected)
+
+    def test_write_text_nodes_escapes(self):
+        nodes = [TextNode("a < b ", TextType.TEXT), TextNode("x", TextType.LINK, "/?a&b")]
+        buffer = io.StringIO()
+        write_text_nodes(nodes, buffer)
+        self.assertEqual(buffer.getvalue(), 'a &lt; b <a href="/?a&amp;b">x</a>')
+        buffer = io.StringIO()
+        write_text_nodes(nodes, buffer, escape=False)
+        self.assertEqual(buffer.getvalue(), 'a < b <a href="/?a&b">x</a>')
+
+    def test_text_nodes_to_html_matches_leaf_nodes(self):
+        text = 'A **b<>** _i&_ `c"` ![al"t](x.png?a=1&b=2) [l\'nk](https://boot.dev/?q="x") end'
+        for spans in (False, True):
+            for escape in (True, False):
+                with self.subTest(spans=spans, escape=escape):
+                    nodes = tokenize_inline(text, spans=spans)
+                    expected = "".join(text_node_to_html_node(node).to_html(escape) for node in nodes)
+                    self.assertEqual(expected, text_nodes_to_html(nodes, escape))
+
+    def test_text_nodes_to_html_validates(self):
+        with self.assertRaises(ValueError):
+            text_nodes_to_html([TextNode("x", TextType.LINK)])
+        with self.assertRaises(ValueError):
+            text_nodes_to_html([TextNode("x", TextType.IMAGE, "")])
+        with self.assertRaises(TypeError):
+            text_nodes_to_html(["not a node"])
+        # Duck-typed stand-ins are rejected, not rendered
+        with self.assertRaises(TypeError):
+            text_nodes_to_html([SimpleNamespace(text="x", text_type=TextType.TEXT, url=None)])
+        self.assertEqual("", text_nodes_to_html([]))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+
+from build import build_site, content_hash
+from output_writer import OutputWriter, write_atomic
+from site_test_case import SiteTestCase
+
+
+class TestOutputWriter(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.output, "blog", "post.html")
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_write_atomic_creates_directories(self):
+        write_atomic(self.path, b"<p>post</p>")
+        self.assertEqual(self.read(), b"<p>post</p>")
+        self.assertListEqual(["post.html"], os.listdir(os.path.dirname(self.path)))
+
+    def test_identical_bytes_are_not_rewritten(self):
+        writer = OutputWriter()
+        self.assertTrue(writer.write(self.path, b"<p>post</p>"))
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(writer.write(self.path, b"<p>post</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+        self.assertListEqual([self.path], writer.written)
+        self.assertListEqual([self.path], writer.unchanged)
+
+    def test_same_size_different_bytes_are_rewritten(self):
+        writer = OutputWriter()
+        writer.write(self.path, b"<p>one</p>")
+        self.assertTrue(writer.write(self.path, b"<p>two</p>"))
+        self.assertEqual(self.read(), b"<p>two</p>")
+
+    def test_write_atomic_streams_chunks(self):
+        write_atomic(self.path, iter(["<p>", "caf\u00e9", "</p>"]))
+        self.assertEqual(self.read(), "<p>caf\u00e9</p>".encode("utf-8"))
+
+    def test_file_modified_after_the_record_is_compared(self):
+        writer = OutputWriter()
+        writer.write(self.path, b"<p>one</p>")
+        os.utime(self.path, ns=(0, 0))
+        digest = content_hash(b"<p>one</p>")
+        # Edited outside the build after the manifest was saved, same size
+        with open(self.path, "wb") as f:
+            f.write(b"<p>two</p>")
+        self.assertTrue(OutputWriter(recorded_ns=1).write(self.path, b"<p>one</p>", digest, digest))
+        self.assertEqual(self.read(), b"<p>one</p>")
+
+    def test_matching_stored_digest_skips_the_compare(self):
+        writer = OutputWriter()
+        writer.write(self.path, b"<p>one</p>")
+        digest = content_hash(b"<p>one</p>")
+        self.assertFalse(writer.write(self.path, b"<p>one</p>", digest, digest))
+        self.assertTrue(writer.write(self.path, b"<p>two</p>", content_hash(b"<p>two</p>"), digest))
+        self.assertEqual(self.read(), b"<p>two</p>")
+
+
+class TestBuildWritesOnlyChanges(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+
+    def test_rebuild_with_identical_output_keeps_the_file(self):
+        build_site(self.content, self.template, self.output)
+        output = os.path.join(self.output, "index.html")
+        os.utime(output, ns=(0, 0))
+        # Without a manifest every page is rendered again, to the same bytes
+        os.remove(os.path.join(self.output, ".manifest.json"))
+        result = build_site(self.content, self.template, self.output)
+        self.assertListEqual(["index.md"], result.built)
+        self.assertListEqual(["index.md"], result.unchanged)
+        self.assertEqual(os.stat(output).st_mtime_ns, 0)
+
+    def test_generated_files_are_reported(self):
+        build_site(self.content, self.template, self.output, base_url="https://example.com")
+        result = build_site(self.content, self.template, self.output, base_url="https://example.com")
+        self.assertEqual([], result.writes.written)
+        os.remove(os.path.join(self.output, ".manifest.json"))
+        result = build_site(self.content, self.template, self.output, base_url="https://example.com")
+        names = sorted(os.path.basename(path) for path in result.writes.written + result.writes.unchanged)
+        self.assertListEqual(["feed.xml", "index.html", "sitemap.xml"], names)
+
+    def test_changed_output_is_rewritten(self):
+        build_site(self.content, self.template, self.output)
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        result = build_site(self.content, self.template, self.output)
+        self.assertListEqual([], result.unchanged)
+        with open(os.path.join(self.output, "index.html"), encoding="utf-8") as f:
+            self.assertTrue(f.read().startswith("<h1>Home</h1>"))
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from build import SiteBuilder, content_hash, render_page
+from converter import markdown_to_html, parse_markdown, parsed_to_html
+from parse_cache import ParseCache, decode, encode, parse_markdown_cached
+
+MARKDOWN = (
+    "# Title\n\n"
+    "Some **bold** and _italic_ with `code`, a [link](/a) and ![img](/i.png)\n\n"
+    "> quote [q](/q)\n\n"
+    "- one\n- two\n\n"
+    "1. first\n2. second\n\n"
+    "```\nprint('hi')\n```\n"
+)
+
+
+class TestEncoding(unittest.TestCase):
+    def test_round_trip(self):
+        targets = []
+        parsed = parse_markdown(MARKDOWN, targets)
+        decoded, decoded_targets = decode(encode(parsed, targets))
+        self.assertEqual(parsed_to_html(parsed), parsed_to_html(decoded))
+        self.assertListEqual(targets, decoded_targets)
+        self.assertEqual(markdown_to_html(MARKDOWN), parsed_to_html(decoded))
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.directory = os.path.join(self.root, "cache")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_hit_after_miss(self):
+        cache = ParseCache(self.directory)
+        digest = content_hash(MARKDOWN.encode())
+        first = parse_markdown_cached(cache, digest, MARKDOWN)
+        targets = []
+        second = parse_markdown_cached(cache, digest, MARKDOWN, targets)
+        self.assertEqual((1, 1), cache.info()[:2])
+        self.assertEqual(parsed_to_html(first), parsed_to_html(second))
+        self.assertListEqual(["/a", "/i.png", "/q"], [url for _, _, url in targets])
+
+    def test_shared_between_instances(self):
+        ParseCache(self.directory).put("abc", parse_markdown("x"), [])
+        self.assertIsNotNone(ParseCache(self.directory).get("abc"))
+
+    def test_parser_version_is_part_of_the_key(self):
+        import parse_cache
+
+        cache = ParseCache(self.directory)
+        cache.put("abc", parse_markdown("x"), [])
+        original = parse_cache.PARSER_VERSION
+        parse_cache.PARSER_VERSION = original + 1
+        try:
+            self.assertIsNone(cache.get("abc"))
+        finally:
+            parse_cache.PARSER_VERSION = original
+
+    def test_corrupt_entry_is_a_miss(self):
+        cache = ParseCache(self.directory)
+        cache.put("abc", parse_markdown("x"), [])
+        with open(cache._path("abc"), "wb") as f:
+            f.write(b"\x00garbage")
+        self.assertIsNone(cache.get("abc"))
+        self.assertFalse(os.path.exists(cache._path("abc")))
+
+    def test_lru_eviction(self):
+        parsed = parse_markdown("word " * 200)
+        size = len(encode(parsed, []))
+        cache = ParseCache(self.directory, max_bytes=size * 5)
+        for i in range(5):
+            cache.put(f"d{i}", parsed, [])
+            os.utime(cache._path(f"d{i}"), ns=(0, (i + 1) * 10**9))
+        cache.get("d0")
+        cache.put("d5", parsed, [])
+        remaining = {name.split("-")[0] for name in os.listdir(self.directory)}
+        self.assertIn("d0", remaining)
+        self.assertIn("d5", remaining)
+        self.assertNotIn("d1", remaining)
+        self.assertLessEqual(len(remaining) * size, size * 5)
+        self.assertGreater(cache.info().evicted, 0)
+
+    def test_concurrent_writers(self):
+        parsed = parse_markdown(MARKDOWN)
+        caches = [ParseCache(self.directory, max_bytes=4096) for _ in range(4)]
+
+        def work(index):
+            cache = caches[index % 4]
+            for i in range(25):
+                cache.put(f"d{i % 10}", parsed, [])
+                entry = cache.get(f"d{(i + index) % 10}")
+                if entry is not None:
+                    self.assertEqual(parsed_to_html(parsed), parsed_to_html(entry[0]))
+
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(work, range(8)))
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".tmp")])
+
+    def test_stale_temp_files_are_removed(self):
+        cache = ParseCache(self.directory, max_bytes=1)
+        os.makedirs(self.directory)
+        stale = os.path.join(self.directory, "leftover.tmp")
+        with open(stale, "wb") as f:
+            f.write(b"x")
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        cache.evict()
+        self.assertFalse(os.path.exists(stale))
+
+    def test_template_change_reuses_parse(self):
+        content = os.path.join(self.root, "content")
+        template = os.path.join(self.root, "template.html")
+        os.makedirs(content)
+        with open(os.path.join(content, "index.md"), "w") as f:
+            f.write(MARKDOWN)
+        with open(template, "w") as f:
+            f.write("{{ Content }}")
+        builder = SiteBuilder(content, template, os.path.join(self.root, "public"), parse_cache_dir=self.directory)
+        builder.build()
+        with open(template, "w") as f:
+            f.write("<main>{{ Content }}</main>")
+        self.assertListEqual(["index.md"], builder.build().built)
+        self.assertEqual((1, 1), builder.parse_cache.info()[:2])
+        self.assertEqual(3, len(builder.manifest["pages"]["index.md"]["links"]))
+        self.assertEqual(
+            render_page(MARKDOWN, "<main>{{ Content }}</main>"),
+            render_page(MARKDOWN, "<main>{{ Content }}</main>", parse_cache=builder.parse_cache),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from render_cache import RenderCache, subtree_digest
+
+
+def nav():
+    return ParentNode(
+        "nav",
+        [
+            LeafNode("Home", "a", {"href": "/"}),
+            LeafNode("Blog", "a", {"href": "/blog"}),
+        ],
+        {"class": "site-nav"},
+    )
+
+
+class TestRenderCache(unittest.TestCase):
+    def test_output_matches_to_html(self):
+        page = ParentNode("body", [nav(), ParentNode("main", [LeafNode("Hi", "p")])])
+        self.assertEqual(RenderCache().render(page), page.to_html())
+
+    def test_repeated_fragments_hit(self):
+        cache = RenderCache()
+        first = cache.render(ParentNode("body", [nav(), LeafNode("one", "p")]))
+        self.assertEqual(cache.cache_info().hits, 0)
+        second = cache.render(ParentNode("body", [nav(), LeafNode("two", "p")]))
+        info = cache.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 3)
+        self.assertIn('<nav class="site-nav">', second)
+        self.assertNotEqual(first, second)
+
+    def test_structurally_equal_nodes_share_digest(self):
+        self.assertEqual(subtree_digest(nav()), subtree_digest(nav()))
+        other = nav()
+        other.props = {"class": "other"}
+        self.assertNotEqual(subtree_digest(nav()), subtree_digest(other))
+
+    def test_mutation_is_not_served_stale(self):
+        cache = RenderCache()
+        node = nav()
+        cache.render(node)
+        node.children[0].value = "Start"
+        self.assertIn(">Start</a>", cache.render(node))
+        node.children.append(LeafNode("About", "a", {"href": "/about"}))
+        self.assertIn(">About</a>", cache.render(node))
+
+    def test_rerender_hits(self):
+        cache = RenderCache()
+        page = ParentNode("body", [nav(), ParentNode("main", [LeafNode("Hi", "p")])])
+        html = cache.render(page)
+        self.assertEqual(cache.render(page), html)
+        self.assertEqual(cache.cache_info().hits, 1)
+
+    def test_deep_tree(self):
+        node = LeafNode("x", "b")
+        for _ in range(3000):
+            node = ParentNode("span", [node])
+        cache = RenderCache()
+        self.assertEqual(cache.render(node), node.to_html())
+        self.assertEqual(cache.render(node), node.to_html())
+
+    def test_lru_eviction(self):
+        cache = RenderCache(maxsize=2)
+        for text in ("a", "b", "c"):
+            cache.render(ParentNode("p", [LeafNode(text, None)]))
+        self.assertEqual(cache.cache_info().currsize, 2)
+        cache.render(ParentNode("p", [LeafNode("a", None)]))
+        self.assertEqual(cache.cache_info().hits, 0)
+
+        cache.clear()
+        self.assertEqual(cache.cache_info(), (0, 0, 2, 0))
+
+    def test_escape_is_part_of_the_key(self):
+        cache = RenderCache()
+        node = ParentNode("p", [LeafNode("a & b", None)])
+        self.assertEqual(cache.render(node), "<p>a &amp; b</p>")
+        self.assertEqual(cache.render(node, escape=False), "<p>a & b</p>")
+        self.assertEqual(cache.cache_info().hits, 0)
+
+    def test_lazy_children_are_not_cached(self):
+        cache = RenderCache()
+        for _ in range(2):
+            items = (LeafNode(str(i), "li") for i in range(2))
+            page = ParentNode("body", [nav(), ParentNode("ul", items)])
+            self.assertEqual(
+                cache.render(page),
+                '<body><nav class="site-nav"><a href="/">Home</a><a href="/blog">Blog</a></nav>'
+                "<ul><li>0</li><li>1</li></ul></body>",
+            )
+        # Only the fully materialised nav subtree is cached
+        self.assertEqual(cache.cache_info(), (1, 1, 1024, 1))
+
+    def test_empty_children_raises(self):
+        with self.assertRaises(ValueError):
+            RenderCache().render(ParentNode("div", []))
+
+
+if __name__ == "__main__":
+    unittest.main()
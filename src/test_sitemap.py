@@ -0,0 +1,195 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+
+from build import build_site
+from sitemap import (
+    SITEMAP_NS,
+    Generator,
+    generate_feed,
+    generate_listing,
+    generate_sitemaps,
+    listing_path,
+    page_url,
+)
+from template import Template
+
+NS = {"s": SITEMAP_NS}
+
+
+def make_pages(count):
+    return {
+        f"p{i:04}.md": {
+            "output": f"p{i:04}.html",
+            "title": f"Page {i}",
+            "hash": f"h{i}",
+            "mtime_ns": (1_700_000_000 + i) * 10**9,
+        }
+        for i in range(count)
+    }
+
+
+class GeneratorTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.output = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def parse(self, rel):
+        return ET.parse(os.path.join(self.output, rel)).getroot()
+
+    def read(self, rel):
+        with open(os.path.join(self.output, rel), encoding="utf-8") as f:
+            return f.read()
+
+
+class TestSitemap(GeneratorTestCase):
+    def test_page_url(self):
+        self.assertEqual("https://x.dev/", page_url("https://x.dev/", "index.html"))
+        self.assertEqual("https://x.dev/blog/", page_url("https://x.dev", "blog/index.html"))
+        self.assertEqual("https://x.dev/a%20b.html", page_url("https://x.dev", "a b.html"))
+
+    def test_single_sitemap(self):
+        generator = Generator(self.output)
+        generate_sitemaps(generator, make_pages(3), "https://x.dev")
+        root = self.parse("sitemap.xml")
+        locs = [loc.text for loc in root.findall("s:url/s:loc", NS)]
+        self.assertListEqual(["https://x.dev/p0000.html", "https://x.dev/p0001.html", "https://x.dev/p0002.html"], locs)
+        self.assertEqual("2023-11-14", root.find("s:url/s:lastmod", NS).text)
+
+    def test_sharded_sitemap(self):
+        generator = Generator(self.output)
+        generate_sitemaps(generator, make_pages(25), "https://x.dev", limit=10)
+        index = self.parse("sitemap.xml")
+        self.assertEqual(f"{{{SITEMAP_NS}}}sitemapindex", index.tag)
+        self.assertListEqual(
+            [f"https://x.dev/sitemap-{i}.xml" for i in (1, 2, 3)],
+            [loc.text for loc in index.findall("s:sitemap/s:loc", NS)],
+        )
+        counts = [len(self.parse(f"sitemap-{i}.xml").findall("s:url", NS)) for i in (1, 2, 3)]
+        self.assertListEqual([10, 10, 5], counts)
+
+    def test_only_changed_shards_are_rewritten(self):
+        pages = make_pages(25)
+        first = Generator(self.output)
+        generate_sitemaps(first, pages, "https://x.dev", limit=10)
+        first.finish()
+        pages["p0015.md"]["mtime_ns"] += 86400 * 10**9
+        second = Generator(self.output, first.digests)
+        generate_sitemaps(second, pages, "https://x.dev", limit=10)
+        self.assertListEqual(["sitemap-2.xml"], second.written)
+
+        third = Generator(self.output, second.digests)
+        generate_sitemaps(third, make_pages(5), "https://x.dev", limit=10)
+        result = third.finish()
+        self.assertListEqual(["sitemap-1.xml", "sitemap-2.xml", "sitemap-3.xml"], result.removed)
+        self.assertEqual(f"{{{SITEMAP_NS}}}urlset", self.parse("sitemap.xml").tag)
+
+
+class TestFeed(GeneratorTestCase):
+    def test_latest_entries(self):
+        generator = Generator(self.output)
+        pages = make_pages(30)
+        pages["p0000.md"]["title"] = "Fish & <Chips>"
+        pages["p0000.md"]["mtime_ns"] = 1_800_000_000 * 10**9
+        generate_feed(generator, pages, "https://x.dev", "My Site", size=5)
+        root = self.parse("feed.xml")
+        titles = [item.find("title").text for item in root.iter("item")]
+        self.assertListEqual(["Fish & <Chips>", "Page 29", "Page 28", "Page 27", "Page 26"], titles)
+        self.assertEqual("My Site", root.find("channel/title").text)
+
+    def test_unchanged_feed_is_skipped(self):
+        pages = make_pages(3)
+        first = Generator(self.output)
+        generate_feed(first, pages, "https://x.dev", "S")
+        second = Generator(self.output, first.digests)
+        generate_feed(second, pages, "https://x.dev", "S")
+        self.assertListEqual(["feed.xml"], second.skipped)
+
+    def test_touch_does_not_rewrite_feed(self):
+        pages = make_pages(3)
+        first = Generator(self.output)
+        generate_feed(first, pages, "https://x.dev", "S")
+        pages["p0002.md"]["mtime_ns"] += 10**9
+        second = Generator(self.output, first.digests)
+        generate_feed(second, pages, "https://x.dev", "S")
+        self.assertListEqual([], second.written)
+
+
+class TestListing(GeneratorTestCase):
+    TEMPLATE = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+
+    def test_pagination(self):
+        generator = Generator(self.output)
+        generate_listing(generator, make_pages(7), self.TEMPLATE, 3)
+        self.assertListEqual(["pages/index.html", "pages/2.html", "pages/3.html"], generator.written)
+        first = self.read("pages/index.html")
+        self.assertIn("<title>Pages (1/3)</title>", first)
+        self.assertIn('<li><a href="/p0000.html">Page 0</a></li>', first)
+        self.assertIn('href="/pages/2.html" rel="next"', first)
+        self.assertNotIn("prev", first)
+        last = self.read("pages/3.html")
+        self.assertIn('<a href="/pages/2.html" rel="prev">Previous</a>', last)
+        self.assertEqual(1, last.count("<li>"))
+
+    def test_edit_rewrites_only_its_page(self):
+        pages = make_pages(7)
+        first = Generator(self.output)
+        generate_listing(first, pages, self.TEMPLATE, 3)
+        pages["p0004.md"]["title"] = "Renamed"
+        second = Generator(self.output, first.digests)
+        generate_listing(second, pages, self.TEMPLATE, 3)
+        self.assertListEqual(["pages/2.html"], second.written)
+        self.assertIn("Renamed", self.read("pages/2.html"))
+
+    def test_template_change_rewrites_all(self):
+        pages = make_pages(4)
+        first = Generator(self.output)
+        generate_listing(first, pages, self.TEMPLATE, 3)
+        second = Generator(self.output, first.digests)
+        generate_listing(second, pages, Template("<h1>{{ Title }}</h1>{{ Content }}"), 3)
+        self.assertEqual(2, len(second.written))
+
+    def test_collision_with_content_page_raises(self):
+        generator = Generator(self.output, reserved={"pages/index.html"})
+        with self.assertRaises(ValueError):
+            generate_listing(generator, make_pages(2), self.TEMPLATE, 3)
+
+    def test_listing_path(self):
+        self.assertEqual("pages/index.html", listing_path(1))
+        self.assertEqual("archive/4.html", listing_path(4, "archive"))
+
+
+class TestBuildIntegration(GeneratorTestCase):
+    def test_build_generates_and_skips(self):
+        root = self.output
+        content = os.path.join(root, "content")
+        output = os.path.join(root, "public")
+        template = os.path.join(root, "template.html")
+        os.makedirs(content)
+        for name in ("a", "b"):
+            with open(os.path.join(content, f"{name}.md"), "w") as f:
+                f.write(f"# Title {name}\n\n[next](/pages/)")
+        with open(template, "w") as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+        kwargs = dict(base_url="https://x.dev", site_title="X", listing_size=10)
+        result = build_site(content, template, output, **kwargs)
+        self.assertListEqual(["sitemap.xml", "feed.xml", "pages/index.html"], result.generated.written)
+        self.assertListEqual([], result.broken)
+        with open(os.path.join(output, "pages", "index.html")) as f:
+            self.assertIn(">Title a</a>", f.read())
+
+        result = build_site(content, template, output, **kwargs)
+        self.assertListEqual([], result.generated.written)
+
+        result = build_site(content, template, output)
+        self.assertListEqual(["feed.xml", "pages/index.html", "sitemap.xml"], result.generated.removed)
+        self.assertFalse(os.path.exists(os.path.join(output, "sitemap.xml")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,17 @@
+import pickle
+import unittest
+
+from split_delimiter import (
+    InlineSyntaxError,
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_image_link,
+    split_nodes_link,
+    tokenize_inline,
+)
+from textnode import SpanTextNode, TextNode, TextType
+
+
 def test_bold_text_type(self):
     old_nodes = [TextNode("hello,world", "bold")]
     result = split_nodes_delimiter(old_nodes, ",", "bold")
@@ -52,5 +66,191 @@ def test_different_delimiter(self):
         self.assertEqual(result, expected)
 
 
+class TestSplitNodesImageLink(unittest.TestCase):
+    def test_split_images(self):
+        node = TextNode(
+            "This is text with an ![image](https://i.imgur.com/zjjcJKZ.png) and another ![second image](https://i.imgur.com/3elNhQu.png)",
+            TextType.TEXT,
+        )
+        self.assertListEqual(
+            [
+                TextNode("This is text with an ", TextType.TEXT),
+                TextNode("image", TextType.IMAGE, "https://i.imgur.com/zjjcJKZ.png"),
+                TextNode(" and another ", TextType.TEXT),
+                TextNode("second image", TextType.IMAGE, "https://i.imgur.com/3elNhQu.png"),
+            ],
+            split_nodes_image([node]),
+        )
+
+    def test_split_links(self):
+        node = TextNode(
+            "[to boot dev](https://www.boot.dev) and [to youtube](https://www.youtube.com) now",
+            TextType.TEXT,
+        )
+        self.assertListEqual(
+            [
+                TextNode("to boot dev", TextType.LINK, "https://www.boot.dev"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("to youtube", TextType.LINK, "https://www.youtube.com"),
+                TextNode(" now", TextType.TEXT),
+            ],
+            split_nodes_link([node]),
+        )
+
+    def test_unmatched_nodes_are_reused(self):
+        node = TextNode("no targets here", TextType.TEXT)
+        bold = TextNode("[not](split)", TextType.BOLD)
+        result = split_nodes_link(split_nodes_image([node, bold]))
+        self.assertIs(result[0], node)
+        self.assertIs(result[1], bold)
+
+    def test_repeated_target(self):
+        node = TextNode("[a](x) then [a](x)", TextType.TEXT)
+        self.assertListEqual(
+            [
+                TextNode("a", TextType.LINK, "x"),
+                TextNode(" then ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "x"),
+            ],
+            split_nodes_link([node]),
+        )
+
+    def test_combined_pass_matches_sequential(self):
+        samples = [
+            "an ![image](https://i.imgur.com/zjjcJKZ.png) and a [link](https://boot.dev)",
+            "![first](a.png)![second](b.png)[one](x)[two](y)",
+            "!![bang](https://example.com) and ![alt] and ![x](y(z)) [ok](fine)",
+            "nothing to split",
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                nodes = [TextNode(text, TextType.TEXT), TextNode("[b](c)", TextType.CODE)]
+                self.assertListEqual(
+                    split_nodes_link(split_nodes_image(nodes)),
+                    split_nodes_image_link(nodes),
+                )
+
+
+class TestTokenizeInline(unittest.TestCase):
+    def chained(self, text):
+        nodes = [TextNode(text, TextType.TEXT)]
+        nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+        nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+        nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+        nodes = split_nodes_image(nodes)
+        return split_nodes_link(nodes)
+
+    def test_matches_chained_functions(self):
+        samples = [
+            "",
+            "plain text only",
+            "This is **text** with an _italic_ word and a `code block`",
+            "**bold** at the start and _italic_ at the end_ _",
+            "an ![image](https://i.imgur.com/zjjcJKZ.png) and a [link](https://boot.dev)",
+            "![first](a.png)![second](b.png)[one](x)[two](y)",
+            "a***b***c",
+            "****empty bold and __ empty italic",
+            "a broken [link(https://example.com) and ![img](https://example.com",
+            "!![bang](https://example.com) and ![alt]",
+            "text with **bold [link](https://example.com)** inside",
+            "`code with [link](https://example.com)` kept literal",
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertListEqual(self.chained(text), tokenize_inline(text))
+
+    def test_all_types(self):
+        text = (
+            "This is **text** with an _italic_ word and a `code block` and an "
+            "![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a "
+            "[link](https://boot.dev)"
+        )
+        self.assertListEqual(
+            [
+                TextNode("This is ", TextType.TEXT),
+                TextNode("text", TextType.BOLD),
+                TextNode(" with an ", TextType.TEXT),
+                TextNode("italic", TextType.ITALIC),
+                TextNode(" word and a ", TextType.TEXT),
+                TextNode("code block", TextType.CODE),
+                TextNode(" and an ", TextType.TEXT),
+                TextNode("obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4Vk.jpeg"),
+                TextNode(" and a ", TextType.TEXT),
+                TextNode("link", TextType.LINK, "https://boot.dev"),
+            ],
+            tokenize_inline(text),
+        )
+
+    def test_nested_emphasis_is_literal(self):
+        # The chained functions reject this input because "**" is split first
+        self.assertListEqual(
+            [TextNode("a **b** c", TextType.ITALIC)],
+            tokenize_inline("_a **b** c_"),
+        )
+        self.assertListEqual(
+            [
+                TextNode("x ", TextType.TEXT),
+                TextNode("bold _and italic_", TextType.BOLD),
+            ],
+            tokenize_inline("x **bold _and italic_**"),
+        )
+
+    def test_link_url_with_delimiters(self):
+        self.assertListEqual(
+            [TextNode("docs", TextType.LINK, "https://example.com/some_page_name")],
+            tokenize_inline("[docs](https://example.com/some_page_name)"),
+        )
+
+    def test_span_nodes(self):
+        text = "This is **text** with an _italic_ word, `code`, ![img](a.png) and [link](b)"
+        nodes = tokenize_inline(text, spans=True)
+        self.assertListEqual(tokenize_inline(text), nodes)
+        for node in nodes:
+            self.assertIsInstance(node, SpanTextNode)
+            self.assertIs(node.source, text)
+
+    def test_split_functions_keep_spans(self):
+        text = "a **b** _c_ ![d](e.png) [f](g) `h`"
+        for chain in (
+            lambda nodes: split_nodes_link(split_nodes_image(
+                split_nodes_delimiter(
+                    split_nodes_delimiter(
+                        split_nodes_delimiter(nodes, "**", TextType.BOLD),
+                        "_", TextType.ITALIC),
+                    "`", TextType.CODE))),
+            lambda nodes: split_nodes_image_link(
+                split_nodes_delimiter(nodes, "`", TextType.CODE)),
+        ):
+            span_result = chain([SpanTextNode(text, 0, len(text), TextType.TEXT)])
+            self.assertListEqual(chain([TextNode(text, TextType.TEXT)]), span_result)
+            for node in span_result:
+                self.assertIsInstance(node, SpanTextNode)
+
+    def test_split_span_inside_larger_source(self):
+        source = "ignored **x** | kept **y** tail"
+        node = SpanTextNode(source, 16, len(source), TextType.TEXT)
+        self.assertListEqual(
+            [
+                TextNode("kept ", TextType.TEXT),
+                TextNode("y", TextType.BOLD),
+                TextNode(" tail", TextType.TEXT),
+            ],
+            split_nodes_delimiter([node], "**", TextType.BOLD),
+        )
+        with self.assertRaises(ValueError):
+            split_nodes_delimiter([SpanTextNode(source, 16, 23, TextType.TEXT)], "**", TextType.BOLD)
+
+    def test_unclosed_reports_offset(self):
+        with self.assertRaises(InlineSyntaxError) as ctx:
+            tokenize_inline("fine **bold** then `broken")
+        self.assertEqual(ctx.exception.offset, 19)
+        self.assertIn("offset 19", str(ctx.exception))
+        self.assertIsInstance(ctx.exception, ValueError)
+
+    def test_syntax_error_pickles(self):
+        error = pickle.loads(pickle.dumps(InlineSyntaxError("not closed", 3)))
+        self.assertEqual(("not closed", 3), (error.message, error.offset))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+import io
+import unittest
+
+from build import render_page
+from htmlnode import LeafNode, ParentNode
+from template import Template, compile_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_parse_segments_and_slots(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertListEqual(["<title>", "</title><main>", "</main>"], template.segments)
+        self.assertListEqual(["Title", "Content"], template.names)
+
+    def test_no_placeholders(self):
+        template = Template("<p>static</p>")
+        self.assertEqual("<p>static</p>", template.render({}))
+
+    def test_render_strings(self):
+        template = Template("{{ Title }}|{{ Content }}|{{ Title }}")
+        self.assertEqual("A|<p>b</p>|A", template.render({"Title": "A", "Content": "<p>b</p>"}))
+
+    def test_missing_value_keeps_placeholder(self):
+        template = Template("{{ Title }} {{ Footer }}")
+        self.assertEqual("A {{ Footer }}", template.render({"Title": "A"}))
+
+    def test_value_is_not_rescanned(self):
+        template = Template("{{ Title }}{{ Content }}")
+        self.assertEqual(
+            "{{ Content }}body",
+            template.render({"Title": "{{ Content }}", "Content": "body"}),
+        )
+
+    def test_render_nodes(self):
+        template = Template("<main>{{ Content }}</main>")
+        node = ParentNode("p", [LeafNode("a & b", "b")])
+        self.assertEqual("<main><p><b>a &amp; b</b></p></main>", template.render({"Content": node}))
+        self.assertEqual(
+            "<main><i>x</i>y</main>",
+            template.render({"Content": iter([LeafNode("x", "i"), "y"])}),
+        )
+
+    def test_write_to_matches_render(self):
+        template = Template("<h1>{{ Title }}</h1>{{ Content }}")
+        values = {"Title": "T", "Content": [ParentNode("p", [LeafNode("text", None)])]}
+        fp = io.StringIO()
+        template.write_to(fp, values)
+        self.assertEqual(template.render(values), fp.getvalue())
+
+    def test_compile_template_is_cached(self):
+        source = "<div>{{ Content }}</div>"
+        self.assertIs(compile_template(source), compile_template(source))
+
+    def test_render_page_matches_replace(self):
+        template = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+        markdown = "# Home\n\nWelcome **home**"
+        self.assertEqual(
+            "<title>Home</title><main><div><h1>Home</h1><p>Welcome <b>home</b></p></div></main>",
+            render_page(markdown, template),
+        )
+        self.assertEqual(render_page(markdown, template), render_page(markdown, compile_template(template)))
+
+
+if __name__ == "__main__":
+    unittest.main()
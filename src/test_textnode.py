@@ -1,6 +1,6 @@
 import unittest
 
-from textnode import TextNode, TextType
+from textnode import SpanTextNode, TextNode, TextType
 
 
 class TestTextNode(unittest.TestCase):
@@ -56,6 +56,12 @@ class TestTextNode(unittest.TestCase):
 
 
 
+    def test_no_instance_dict(self):
+        node = TextNode("Text", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = "value"
+
     def test_repr(self):
         node = TextNode("Hello", TextType.TEXT)
         repr_str = repr(node)
@@ -65,6 +71,22 @@ class TestTextNode(unittest.TestCase):
         self.assertIn("None", repr_str)
 
 
+class TestSpanTextNode(unittest.TestCase):
+    def test_text_is_sliced_from_source(self):
+        source = "Some **bold** text"
+        node = SpanTextNode(source, 7, 11, TextType.BOLD)
+        self.assertEqual(node.text, "bold")
+        self.assertIs(node.source, source)
+        self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_eq_and_repr_match_text_node(self):
+        span = SpanTextNode("see [docs](https://boot.dev)", 5, 9, TextType.LINK, "https://boot.dev")
+        plain = TextNode("docs", TextType.LINK, "https://boot.dev")
+        self.assertEqual(span, plain)
+        self.assertEqual(plain, span)
+        self.assertEqual(repr(span), repr(plain))
+        self.assertNotEqual(span, TextNode("doc", TextType.LINK, "https://boot.dev"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+import unittest
+import urllib.request
+
+from build import SiteBuilder
+from site_test_case import SiteTestCase
+from watch import (
+    InotifyWatcher,
+    PollingWatcher,
+    make_watcher,
+    rebuild,
+    serve,
+    wait_for_changes,
+    watch,
+)
+
+
+class WatchTestCase(SiteTestCase):
+    template_source = "<title>{{ Title }}</title>{{ Content }}"
+
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nHello")
+        self.write(os.path.join(self.content, "about.md"), "# About\n\nUs")
+
+
+class TestWatchers(WatchTestCase):
+    def check_watcher(self, watcher):
+        try:
+            self.assertSetEqual(set(), watcher.changes(0.05))
+            index = os.path.join(self.content, "index.md")
+            self.write(index, "# Home\n\nEdited")
+            self.assertIn(os.path.abspath(index), {os.path.abspath(p) for p in wait_for_changes(watcher, 0.05, 2)})
+
+            blog = os.path.join(self.content, "blog")
+            os.makedirs(blog)
+            wait_for_changes(watcher, 0.05, 2)
+            post = os.path.join(blog, "post.md")
+            self.write(post, "# Post")
+            self.assertIn(os.path.abspath(post), {os.path.abspath(p) for p in wait_for_changes(watcher, 0.05, 2)})
+
+            self.write(self.template, "{{ Content }}")
+            self.assertIn(
+                os.path.abspath(self.template),
+                {os.path.abspath(p) for p in wait_for_changes(watcher, 0.05, 2)},
+            )
+        finally:
+            watcher.close()
+
+    def test_polling_watcher(self):
+        self.check_watcher(PollingWatcher([self.content, self.template], interval=0.01))
+
+    def test_inotify_watcher(self):
+        try:
+            watcher = InotifyWatcher([self.content, self.template])
+        except (OSError, AttributeError):
+            self.skipTest("inotify unavailable")
+        self.check_watcher(watcher)
+
+    def test_unrelated_file_next_to_template_is_ignored(self):
+        watcher = make_watcher([self.content, self.template])
+        try:
+            self.write(os.path.join(self.root, "notes.txt"), "scratch")
+            self.assertSetEqual(set(), wait_for_changes(watcher, 0.05, 0.2))
+        finally:
+            watcher.close()
+
+    def test_burst_is_debounced(self):
+        watcher = make_watcher([self.content])
+        try:
+            for i in range(5):
+                self.write(os.path.join(self.content, f"page{i}.md"), f"# Page {i}")
+            changed = wait_for_changes(watcher, 0.1, 2)
+            self.assertEqual(5, len({os.path.basename(p) for p in changed if p.endswith(".md")}))
+        finally:
+            watcher.close()
+
+
+class TestRebuild(WatchTestCase):
+    def test_rebuild_only_changed_page(self):
+        builder = SiteBuilder(self.content, self.template, self.output)
+        builder.build()
+        index = os.path.join(self.content, "index.md")
+        self.write(index, "# Home\n\nEdited")
+        report = rebuild(builder, {index})
+        self.assertListEqual(["index.md"], report.result.built)
+        self.assertGreaterEqual(report.latency_ms, report.build_ms)
+
+    def test_watch_loop_rebuilds_and_serves(self):
+        builder = SiteBuilder(self.content, self.template, self.output)
+        builder.build()
+        watcher = make_watcher([self.content, self.template])
+        server = serve(self.output, port=0)
+        stop = threading.Event()
+        reports = []
+
+        def on_rebuild(report):
+            reports.append(report)
+            stop.set()
+
+        thread = threading.Thread(target=watch, args=(builder, watcher, 0.02, on_rebuild, stop))
+        thread.start()
+        try:
+            time.sleep(0.05)
+            self.write(os.path.join(self.content, "index.md"), "# Home\n\nFresh")
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+            self.assertListEqual(["index.md"], reports[0].result.built)
+
+            url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+            with urllib.request.urlopen(url) as response:
+                self.assertIn("Fresh", response.read().decode("utf-8"))
+        finally:
+            stop.set()
+            thread.join(5)
+            watcher.close()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,8 @@ class TextType(Enum):
 
 
 class TextNode:
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None) -> None:
         self.text = text
         self.text_type = text_type
@@ -27,3 +29,20 @@ class TextNode:
 
     def __repr__(self) -> str:
         return f"TextNode({repr(self.text)}, TextType.{self.text_type.name}, {repr(self.url)})"
+
+
+class SpanTextNode(TextNode):
+    # A TextNode whose text is source[start:end], sliced only when read.
+    # Compares and reprs exactly like a TextNode with the same text.
+    __slots__ = ("source", "start", "end")
+
+    def __init__(self, source, start, end, text_type, url=None) -> None:
+        self.source = source
+        self.start = start
+        self.end = end
+        self.text_type = text_type
+        self.url = url
+
+    @property
+    def text(self):
+        return self.source[self.start:self.end]
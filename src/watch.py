@@ -0,0 +1,260 @@
+import ctypes
+import ctypes.util
+import functools
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from build import BuildResult, SiteBuilder
+
+# `latency_ms` runs from the newest mtime among the changed files, i.e. the
+# moment the edit hit the disk, to the end of the rebuild.
+Rebuild = namedtuple("Rebuild", ["result", "changed", "build_ms", "latency_ms"])
+
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_MOVE_SELF = 0x800
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+    | _IN_CREATE | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    # Pure-Python fallback: compares (size, mtime) snapshots of every watched
+    # file once per interval.
+    def __init__(self, paths: Iterable[str], interval: float = 0.05) -> None:
+        self.paths = list(paths)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.paths:
+            if os.path.isdir(path):
+                for root, dirs, files in os.walk(path):
+                    for name in files:
+                        self._stat(os.path.join(root, name), snapshot)
+            else:
+                self._stat(path, snapshot)
+        return snapshot
+
+    def _stat(self, path: str, snapshot: dict) -> None:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        snapshot[path] = (st.st_size, st.st_mtime_ns)
+
+    def changes(self, timeout: float) -> Set[str]:
+        deadline = time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            old, self.snapshot = self.snapshot, snapshot
+            changed = {
+                path for path in old.keys() | snapshot.keys()
+                if old.get(path) != snapshot.get(path)
+            }
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+            time.sleep(min(self.interval, remaining))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    # Linux inotify through ctypes: the kernel reports changes as they
+    # happen, so there is no polling interval to wait out.
+    def __init__(self, paths: Iterable[str]) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        self.roots = []
+        # Watching a file's directory (rather than the file) survives editors
+        # that save by writing a new file and renaming it over the old one.
+        self.files = set()
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self.roots.append(path)
+                self._watch_tree(path)
+            else:
+                self.files.add(path)
+                self._watch(os.path.dirname(path))
+
+    def _watch(self, directory: str) -> None:
+        wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed: {os.strerror(errno)}", directory)
+        self.dirs[wd] = directory
+
+    def _watch_tree(self, root: str) -> None:
+        for directory, dirs, files in os.walk(root):
+            self._watch(directory)
+
+    def _relevant(self, path: str) -> bool:
+        if path in self.files:
+            return True
+        return any(path == root or path.startswith(root + os.sep) for root in self.roots)
+
+    def _read_events(self) -> Set[str]:
+        changed = set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # Events were dropped; report every watched path as changed
+                changed.update(self.roots)
+                changed.update(self.files)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & _IN_IGNORED:
+                del self.dirs[wd]
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                self._watch_tree(path)
+            if self._relevant(path):
+                changed.add(path)
+        return changed
+
+    def changes(self, timeout: float) -> Set[str]:
+        readable, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not readable:
+            return set()
+        return self._read_events()
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(paths: Iterable[str], poll: bool = False, interval: float = 0.05):
+    paths = [path for path in paths if os.path.exists(path)]
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            # No inotify (or out of watches): fall back to polling
+            pass
+    return PollingWatcher(paths, interval)
+
+
+def wait_for_changes(
+    watcher, debounce: float = 0.05, timeout: Optional[float] = None
+) -> Set[str]:
+    # Blocks for the first change, then keeps collecting until the watched
+    # paths have been quiet for `debounce` seconds, so a burst of saves (or
+    # a checkout touching many files) costs a single rebuild.
+    changed = watcher.changes(1.0 if timeout is None else timeout)
+    while not changed:
+        if timeout is not None:
+            return changed
+        changed = watcher.changes(1.0)
+    while True:
+        more = watcher.changes(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def _edit_time(paths: Iterable[str]) -> Optional[float]:
+    latest = None
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        if latest is None or mtime > latest:
+            latest = mtime
+    return latest
+
+
+def rebuild(builder: SiteBuilder, changed: Set[str]) -> Rebuild:
+    edited = _edit_time(changed)
+    start = time.perf_counter()
+    result = builder.build()
+    build_ms = (time.perf_counter() - start) * 1000
+    latency_ms = (time.time() - edited) * 1000 if edited is not None else build_ms
+    return Rebuild(result, sorted(changed), build_ms, latency_ms)
+
+
+def format_rebuild(rebuild: Rebuild) -> str:
+    result: BuildResult = rebuild.result
+    line = (
+        f"Rebuilt {len(result.built)} page(s), removed {len(result.removed)} "
+        f"in {rebuild.build_ms:.1f} ms (edit-to-output {rebuild.latency_ms:.1f} ms)"
+    )
+    if result.assets is not None and (result.assets.copied or result.assets.removed):
+        line += f", assets copied {len(result.assets.copied)}, removed {len(result.assets.removed)}"
+    if result.broken:
+        line += f", {len(result.broken)} broken link(s)"
+    return line
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(output_dir: str, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    # Serves output_dir on a daemon thread; call shutdown() on the result to stop
+    handler = functools.partial(_QuietHandler, directory=output_dir)
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def watch(
+    builder: SiteBuilder,
+    watcher,
+    debounce: float = 0.05,
+    on_rebuild: Optional[Callable[[Rebuild], None]] = None,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    # The builder stays alive between rebuilds, keeping its manifest in
+    # memory, so each rebuild only stats the sources and renders what changed.
+    on_rebuild = on_rebuild or (lambda rebuild: print(format_rebuild(rebuild)))
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        changed = wait_for_changes(watcher, debounce, timeout=0.2)
+        if not changed:
+            continue
+        try:
+            report = rebuild(builder, changed)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Build failed: {e}", file=sys.stderr)
+            continue
+        on_rebuild(report)